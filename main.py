@@ -1,20 +1,119 @@
 import argparse
 import logging
+import os
+import signal
 import sys
+import time
 import json
-from src.scraper.scraper import DiscogsScraper, DiscogsScraperError
+from datetime import datetime
+from src.scraper.backend import DiscogsScraperError
 from src.utils.data_processor import DataProcessor
-from settings import DEFAULT_GENRE, MAX_ARTISTS, SELENIUM_HEADLESS
+from src.scraper.releases import RELEASE_SELECTION_STRATEGIES
+from src.utils.shard_writer import COMPRESSION_EXTENSIONS
+from src.utils.jsonl_index import build_index
+from src.utils.merge import merge_outputs, CONFLICT_POLICIES
+from src.utils.profiler import CrawlProfiler
+from src.utils.logging_setup import setup_logging
+from src.scraper.scheduler import CrawlBudget
+from src.scraper.work_queue import SQLiteWorkQueue
+from src.scraper.queue_service import WorkQueueServer, open_work_queue
+from src.scraper.worker import CrawlWorker, KIND_ARTIST, default_worker_id
+from settings import (DEFAULT_GENRE, MAX_ARTISTS, SELENIUM_HEADLESS, RELEASE_SELECTION_STRATEGY,
+                      GRAPH_CRAWL_DEPTH, OUTPUT_COMPRESSION, WORK_QUEUE_LEASE_SECONDS,
+                      WORKER_HEARTBEAT_INTERVAL, WORK_QUEUE_MAX_ATTEMPTS, VIRTUAL_DISPLAY,
+                      LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT, LOG_SAMPLE_BURST, LOG_SAMPLE_RATE,
+                      SCRAPER_BACKEND, WORK_QUEUE_TOKEN)
 
-def setup_logging(log_level: str = "INFO"):
-    logging.basicConfig(
-        level=getattr(logging, log_level.upper()),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('discogs_scraper.log', encoding='utf-8')
-        ]
+def create_backend(args):
+    if args.backend == 'api':
+        from src.scraper.api_client import DiscogsApiClient
+        return DiscogsApiClient()
+    # Importado sob demanda: o backend da API não precisa do Selenium instalado
+    from src.scraper.scraper import DiscogsScraper
+    return DiscogsScraper(headless=SELENIUM_HEADLESS, release_strategy=args.release_strategy,
+                          virtual_display=args.virtual_display)
+
+def write_report(processor: DataProcessor, artists, report_file: str) -> dict:
+    summary = processor.generate_summary_report(artists)
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+def parse_serve_address(value: str):
+    host, _, port = value.rpartition(':')
+    if not host or not port.isdigit():
+        raise argparse.ArgumentTypeError(f"Endereço inválido (use HOST:PORTA): {value}")
+    return host, int(port)
+
+def run_coordinator(args, logger) -> int:
+    queue = SQLiteWorkQueue(args.queue)
+    server = None
+    if args.serve:
+        # Workers em outros hosts acessam a fila por HTTP; o SQLite fica só no disco local
+        server = WorkQueueServer(queue, *args.serve, token=WORK_QUEUE_TOKEN)
+        server.start()
+    try:
+        return _coordinate(args, queue, logger)
+    finally:
+        if server:
+            server.stop()
+
+def _coordinate(args, queue, logger) -> int:
+    scraper = create_backend(args)
+    artist_urls = scraper.search_artists_by_genre(args.genre, args.max_artists)
+    del scraper
+    
+    added = sum(queue.enqueue(KIND_ARTIST, url, {'genre': args.genre}) for url in artist_urls)
+    logger.info(f"Coordinator enfileirou {added} artista(s) em {args.queue}")
+    
+    while True:
+        requeued = queue.requeue_expired()
+        if requeued:
+            logger.warning(f"{requeued} lease(s) expirado(s) voltaram para a fila")
+        
+        logger.info(f"Fila: {queue.stats()}")
+        for worker in queue.workers():
+            logger.info(f"Worker {worker['worker_id']}: {worker.get('processed', 0)} itens, "
+                        f"{worker.get('items_per_minute', 0)} itens/min, "
+                        f"visto há {time.time() - worker['last_seen']:.0f}s")
+        
+        if queue.is_drained():
+            break
+        time.sleep(WORKER_HEARTBEAT_INTERVAL)
+    
+    logger.info(f"Fila concluída: {queue.stats()}")
+    return 0
+
+def run_worker(args, logger) -> int:
+    queue = open_work_queue(args.queue, WORK_QUEUE_TOKEN)
+    processor = DataProcessor()
+    worker_id = args.worker_id or default_worker_id()
+    output_file = os.path.join(processor.output_dir, args.output or f"discogs_data_{worker_id}.jsonl")
+    
+    scraper = create_backend(args)
+    worker = CrawlWorker(
+        queue, scraper, output_file, worker_id,
+        lease_seconds=WORK_QUEUE_LEASE_SECONDS,
+        heartbeat_interval=WORKER_HEARTBEAT_INTERVAL,
+        max_attempts=WORK_QUEUE_MAX_ATTEMPTS
+    )
+    processed = worker.run()
+    logger.info(f"Worker {worker_id} finalizado: {worker.stats()}")
+    
+    if processed:
+        write_report(processor, worker.artists, output_file.replace('.jsonl', '_report.json'))
+        logger.info(f"Dados exportados para: {output_file}")
+    return 0
+
+def run_merge(args, logger) -> int:
+    processor = DataProcessor()
+    filename = args.output or f"discogs_merged_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    report = merge_outputs(
+        args.merge, os.path.join(processor.output_dir, filename), args.merge_policy,
+        compression=args.compression, max_records=args.shard_records, max_bytes=args.shard_bytes
     )
+    logger.info(f"Resumo do merge: {report['summary']}")
+    return 0
 
 def main():
     parser = argparse.ArgumentParser(description='Web Scraper do Discogs para teste de Engenharia de Dados')
@@ -27,33 +126,117 @@ def main():
     parser.add_argument('--log-level', '-l', type=str, default='INFO',
                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
                        help='Nível de logging (padrão: INFO)')
+    parser.add_argument('--release-strategy', '-r', type=str, default=RELEASE_SELECTION_STRATEGY,
+                       choices=list(RELEASE_SELECTION_STRATEGIES),
+                       help=f'Release canônico por master (padrão: {RELEASE_SELECTION_STRATEGY})')
+    parser.add_argument('--graph-depth', type=int, default=GRAPH_CRAWL_DEPTH,
+                       help=f'Profundidade do crawl de membros/grupos (padrão: {GRAPH_CRAWL_DEPTH})')
+    parser.add_argument('--shard-records', type=int,
+                       help='Rotaciona a saída em shards com até N artistas cada')
+    parser.add_argument('--shard-bytes', type=int,
+                       help='Rotaciona a saída em shards de até N bytes (não comprimidos)')
+    parser.add_argument('--compression', type=str, default=OUTPUT_COMPRESSION,
+                       choices=list(COMPRESSION_EXTENSIONS),
+                       help=f'Compressão dos shards (padrão: {OUTPUT_COMPRESSION})')
+    parser.add_argument('--index', action='store_true',
+                       help='Gera índice de offsets por id (.idx) ao lado do JSONL')
+    parser.add_argument('--sqlite', type=str,
+                       help='Também grava os dados em um banco SQLite (upsert por id)')
+    parser.add_argument('--queue', type=str,
+                       help='Fila de trabalho: arquivo SQLite local ou, nos workers, URL http:// do coordinator')
+    parser.add_argument('--serve', type=parse_serve_address, metavar='HOST:PORTA',
+                       help='Coordinator expõe a fila por HTTP para workers em outros hosts')
+    parser.add_argument('--role', type=str, choices=['coordinator', 'worker'],
+                       help='Papel nesta execução distribuída (requer --queue)')
+    parser.add_argument('--worker-id', type=str,
+                       help='Identificador do worker (padrão: host-pid)')
+    parser.add_argument('--backend', type=str, default=SCRAPER_BACKEND, choices=['browser', 'api'],
+                       help=f'Fonte dos dados: navegador (Selenium) ou API oficial (padrão: {SCRAPER_BACKEND})')
+    parser.add_argument('--merge', type=str, nargs='+', metavar='ARQUIVO',
+                       help='Combina saídas de várias coletas (JSONL, shards ou manifests) deduplicando por id')
+    parser.add_argument('--merge-policy', type=str, default='non_empty', choices=list(CONFLICT_POLICIES),
+                       help='Valor mantido quando o mesmo id tem campos diferentes (padrão: non_empty)')
+    parser.add_argument('--virtual-display', action='store_true', default=VIRTUAL_DISPLAY,
+                       help='Roda cada navegador em um display Xvfb próprio (servidores Linux)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Gera perfil de CPU (flamegraph) e memória ao lado do JSONL')
+    parser.add_argument('--deadline', type=float,
+                       help='Prazo da coleta em segundos; ao esgotar, exporta o que já foi coletado')
+    parser.add_argument('--page-budget', type=int,
+                       help='Número máximo de páginas carregadas na coleta')
     
     args = parser.parse_args()
     
-    setup_logging(args.log_level)
+    setup_logging(args.log_level, LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT,
+                  LOG_SAMPLE_BURST, LOG_SAMPLE_RATE)
     logger = logging.getLogger(__name__)
     
+    if args.role and not args.queue:
+        parser.error('--role requer --queue')
+    if args.serve and args.role != 'coordinator':
+        parser.error('--serve só pode ser usado com --role coordinator')
+    if args.role == 'coordinator' and args.queue.startswith(('http://', 'https://')):
+        parser.error('o coordinator precisa de um arquivo SQLite local em --queue')
+    if args.index and (args.shard_records or args.shard_bytes):
+        # O índice guarda offsets do JSONL não comprimido; shards não são indexáveis
+        parser.error('--index não pode ser usado com --shard-records/--shard-bytes')
+    
+    profiler = None
+    output_prefix = None
     try:
+        if args.merge:
+            return run_merge(args, logger)
+        if args.role == 'coordinator':
+            return run_coordinator(args, logger)
+        if args.role == 'worker':
+            return run_worker(args, logger)
+        
         logger.info(f"Iniciando scraping do Discogs para o gênero: {args.genre}")
         
-        scraper = DiscogsScraper(headless=SELENIUM_HEADLESS)
+        profiler = CrawlProfiler() if args.profile else None
+        if profiler:
+            profiler.start()
+        
+        scraper = create_backend(args)
+        scraper.profiler = profiler
         processor = DataProcessor()
         
-        artists = scraper.scrape_genre_data(args.genre, args.max_artists)
+        budget = None
+        if args.deadline or args.page_budget:
+            budget = CrawlBudget(args.deadline, args.page_budget)
+            # SIGTERM no fim da janela: aborta a página atual e exporta o parcial
+            signal.signal(signal.SIGTERM, lambda signum, frame: budget.cancel())
+        
+        artists = scraper.scrape_genre_data(args.genre, args.max_artists, args.graph_depth, budget)
         
         if not artists:
             logger.warning("Nenhum artista foi coletado. Verifique o gênero especificado.")
             return 1
         
-        jsonl_file = processor.artists_to_jsonl(artists, args.output)
-        logger.info(f"Dados exportados para: {jsonl_file}")
+        if args.shard_records or args.shard_bytes:
+            basename = args.output.replace('.jsonl', '') if args.output else None
+            manifest_file = processor.artists_to_jsonl_shards(
+                artists, basename, args.compression,
+                max_records=args.shard_records, max_bytes=args.shard_bytes
+            )
+            logger.info(f"Shards exportados, manifest: {manifest_file}")
+            output_prefix = manifest_file.replace('_manifest.json', '')
+        else:
+            jsonl_file = processor.artists_to_jsonl(artists, args.output)
+            logger.info(f"Dados exportados para: {jsonl_file}")
+            if args.index:
+                logger.info(f"Índice gerado: {build_index(jsonl_file)}")
+            output_prefix = jsonl_file.replace('.jsonl', '')
+        
+        if args.sqlite:
+            processor.artists_to_sqlite(artists, args.sqlite)
+            logger.info(f"Dados gravados no SQLite: {args.sqlite}")
         
-        summary = processor.generate_summary_report(artists)
+        summary = write_report(processor, artists, f"{output_prefix}_report.json")
         logger.info(f"Resumo da coleta: {summary['summary']}")
         
-        report_file = jsonl_file.replace('.jsonl', '_report.json')
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, ensure_ascii=False, indent=2)
+        if profiler:
+            profiler.snapshot("exportação")
         
         logger.info("Scraping concluído com sucesso!")
         return 0
@@ -64,6 +247,15 @@ def main():
     except Exception as e:
         logger.error(f"Erro inesperado: {e}")
         return 1
+    finally:
+        # Também em falhas e coletas vazias, quando o perfil é mais útil
+        if profiler:
+            if output_prefix is None:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                output_prefix = os.path.join(DataProcessor().output_dir, f"discogs_data_{timestamp}")
+                profiler.snapshot("encerramento")
+            folded_file, allocations_file = profiler.stop(output_prefix)
+            logger.info(f"Perfil gerado: {folded_file}, {allocations_file}")
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
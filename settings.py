@@ -1,7 +1,24 @@
+import os
+
 DISCOGS_BASE_URL = "https://www.discogs.com"
 DEFAULT_GENRE = "Pop"
 MAX_ARTISTS = 10
 MAX_ALBUMS_PER_ARTIST = 10
+# Release canônico por master: "earliest", "main" ou "most_tracks"
+RELEASE_SELECTION_STRATEGY = "main"
+# Profundidade do crawl de membros/grupos (0 = apenas artistas da busca)
+GRAPH_CRAWL_DEPTH = 0
+# Com --deadline/--page-budget: releases por artista coletados antes de completar discografias
+SCHEDULER_TOP_RELEASES = 3
+
+# Fonte dos dados: "browser" (Selenium) ou "api" (API oficial, requer token)
+SCRAPER_BACKEND = "browser"
+DISCOGS_API_URL = "https://api.discogs.com"
+DISCOGS_API_TOKEN = os.environ.get("DISCOGS_API_TOKEN")
+DISCOGS_USER_AGENT = "DiscogsDataScraper/1.0"
+API_POOL_SIZE = 4
+# Requisições restantes na janela a partir das quais a API passa a ser espaçada
+API_RATE_LIMIT_RESERVE = 5
 
 MIN_DELAY = 2
 MAX_DELAY = 4
@@ -9,9 +26,36 @@ MAX_DELAY = 4
 SELENIUM_HEADLESS = False  # Headless não funciona devido ao Cloudflare do Discogs
 SELENIUM_TIMEOUT = 10  
 SELENIUM_PAGE_LOAD_WAIT = 2  
+SELENIUM_PAGE_LOAD_TIMEOUT = 60
+
+# Display virtual (Xvfb) para rodar o Chrome com interface em servidores Linux
+VIRTUAL_DISPLAY = False
+VIRTUAL_DISPLAY_SIZE = (1280, 720)
+VIRTUAL_DISPLAY_DEPTH = 16
+
+# Reciclagem do navegador em coletas longas
+DRIVER_MAX_PAGES = 200
+DRIVER_MAX_RSS_MB = 1500
+DRIVER_HANG_TIMEOUT = 90  # driver.get travado além disso: mata e recria o Chrome
+
+# Execução paralela (coordinator/workers; workers remotos usam a fila via HTTP)
+WORK_QUEUE_LEASE_SECONDS = 600
+WORKER_HEARTBEAT_INTERVAL = 30
+WORK_QUEUE_MAX_ATTEMPTS = 3
+WORK_QUEUE_TOKEN = os.environ.get("WORK_QUEUE_TOKEN")  # exigido pelo --serve quando definido
 
 OUTPUT_DIR = "data/output"
+# ETag/Last-Modified e corpos da API entre execuções (re-coletas recebem 304)
+API_CACHE_PATH = os.path.join(OUTPUT_DIR, "api_cache.db")
+# Compressão dos shards de saída: "gzip", "zstd" (requer zstandard) ou "none"
+OUTPUT_COMPRESSION = "gzip"
 LOG_LEVEL = "INFO"
+LOG_FILE = "discogs_scraper.log"  # JSON estruturado, rotacionado por tamanho
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+# Mensagens por página: passam as primeiras LOG_SAMPLE_BURST por minuto, depois 1 a cada LOG_SAMPLE_RATE
+LOG_SAMPLE_BURST = 20
+LOG_SAMPLE_RATE = 10
 
 DEFAULT_HEADERS = {
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -0,0 +1,363 @@
+import http.client
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from .backend import ScraperBackend, DiscogsScraperError, DeadlineExceededError
+from .data_models import Artist, Album, Track
+from .entity_cache import EntityCache, discogs_id_from_url
+from .http_cache import HttpCache, CacheEntry
+from settings import (DISCOGS_API_URL, DISCOGS_API_TOKEN, DISCOGS_USER_AGENT, API_POOL_SIZE,
+                      API_RATE_LIMIT_RESERVE, API_CACHE_PATH, MAX_ALBUMS_PER_ARTIST)
+
+# Equivalente ao subFilter=Albums do site: descrições de formato que contam como álbum
+ALBUM_FORMAT_DESCRIPTIONS = {'Album', 'LP', 'Mini-Album'}
+NON_ALBUM_FORMAT_DESCRIPTIONS = {'Compilation', 'Single', 'EP', 'Maxi-Single'}
+
+
+def is_album_format(descriptions: List[str]) -> bool:
+    descriptions = {description.strip() for description in descriptions}
+    return bool(descriptions & ALBUM_FORMAT_DESCRIPTIONS) and not descriptions & NON_ALBUM_FORMAT_DESCRIPTIONS
+
+
+class _ConnectionPool:
+    """Pool de conexões HTTP keep-alive para um único host"""
+    def __init__(self, base_url: str, size: int, timeout: float):
+        parts = urlsplit(base_url)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout
+        self.connections_created = 0
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+
+    def acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            self.connections_created += 1
+            return self.connection_class(self.host, self.port, timeout=self.timeout)
+
+    def release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class RateLimiter:
+    """
+    Ritmo guiado pelos headers X-Discogs-Ratelimit*: enquanto há folga as
+    requisições seguem sem espera; perto do limite, elas são espaçadas pela
+    janela de 60s para não esgotar a cota.
+    """
+    def __init__(self, reserve: int = 5, window: float = 60.0,
+                 sleep: Callable[[float], None] = time.sleep, clock: Callable[[], float] = time.monotonic):
+        self.reserve = reserve
+        self.window = window
+        self.sleep = sleep
+        self.clock = clock
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self._last_request = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            if self.limit and self.remaining is not None and self.remaining <= self.reserve:
+                interval = self.window / self.limit
+                delay = self._last_request + interval - self.clock()
+                if delay > 0:
+                    self.sleep(delay)
+            self._last_request = self.clock()
+
+    def update(self, headers) -> None:
+        limit = headers.get('X-Discogs-Ratelimit')
+        remaining = headers.get('X-Discogs-Ratelimit-Remaining')
+        with self._lock:
+            if limit and limit.isdigit():
+                self.limit = int(limit)
+            if remaining and remaining.isdigit():
+                self.remaining = int(remaining)
+
+
+class DiscogsApiClient(ScraperBackend):
+    """
+    Backend que usa a API REST oficial do Discogs em vez de renderizar páginas:
+    uma chamada JSON por artista/discografia/release, com conexões reaproveitadas,
+    ritmo pelos headers de rate limit e requisições condicionais (ETag/If-Modified-Since).
+    Os validadores ficam em um HttpCache em disco (cache_path), reaproveitado entre execuções;
+    com cache_path=None as requisições não são condicionais.
+    """
+    def __init__(self, api_url: str = DISCOGS_API_URL, token: Optional[str] = DISCOGS_API_TOKEN,
+                 base_url: str = "https://www.discogs.com", entity_cache: Optional[EntityCache] = None,
+                 pool_size: int = API_POOL_SIZE, timeout: float = 30, max_retries: int = 3,
+                 cache_path: Optional[str] = API_CACHE_PATH, cache_size: int = 1000,
+                 rate_limiter: Optional[RateLimiter] = None):
+        super().__init__(base_url, entity_cache)
+        self.api_url = api_url.rstrip('/')
+        self.api_path = urlsplit(self.api_url).path
+        self.token = token
+        self.max_retries = max_retries
+        self.cache_size = cache_size
+        self.pool = _ConnectionPool(self.api_url, pool_size, timeout)
+        self.rate_limiter = rate_limiter or RateLimiter(API_RATE_LIMIT_RESERVE)
+        self.requests_made = 0
+        self.not_modified = 0
+        self.http_cache = HttpCache(cache_path) if cache_path else None
+        # Releases principais de masters aceitos como álbum, reaproveitados em scrape_album_details
+        self._release_payloads: "OrderedDict[str, Any]" = OrderedDict()
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _headers(self, cached: Optional[CacheEntry] = None) -> Dict[str, str]:
+        headers = {
+            'User-Agent': DISCOGS_USER_AGENT,
+            'Accept': 'application/vnd.discogs.v2.discogs+json',
+            'Accept-Encoding': 'identity',
+        }
+        if self.token:
+            headers['Authorization'] = f"Discogs token={self.token}"
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def _request(self, path: str, cached: Optional[CacheEntry] = None) -> Tuple[int, Any, bytes]:
+        conn = self.pool.acquire()
+        # Com --deadline, a requisição não espera além do prazo da coleta
+        conn.timeout = self._capped(self.pool.timeout)
+        if conn.sock is not None:
+            conn.sock.settimeout(conn.timeout)
+        try:
+            conn.request('GET', path, headers=self._headers(cached))
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            raise
+        if response.getheader('Connection', '').lower() == 'close':
+            conn.close()
+        else:
+            self.pool.release(conn)
+        return response.status, response.headers, body
+
+    def _get_json(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        path = f"{self.api_path}{endpoint}"
+        if params:
+            path += f"?{urlencode(params)}"
+
+        for attempt in range(self.max_retries):
+            self._check_deadline(path)
+            self.rate_limiter.wait()
+            # Lido uma vez por tentativa: o 304 responde exatamente aos validadores enviados
+            cached = self.http_cache.get(path) if self.http_cache is not None else None
+            try:
+                status, headers, body = self._request(path, cached)
+            except (http.client.HTTPException, OSError) as e:
+                self.logger.warning(f"Tentativa {attempt + 1} falhou para {path}: {e}")
+                self.rate_limiter.sleep(self._capped(2 ** attempt))
+                continue
+
+            self.requests_made += 1
+            self.rate_limiter.update(headers)
+
+            if status == 304:
+                if cached is not None:
+                    self.not_modified += 1
+                    return json.loads(cached[2])
+                raise DiscogsScraperError(f"HTTP 304 sem requisição condicional em {path}")
+
+            if status == 429:
+                retry_after = headers.get('Retry-After')
+                delay = float(retry_after) if retry_after and retry_after.isdigit() else self.rate_limiter.window
+                if self._capped(delay) < delay:
+                    raise DeadlineExceededError(f"Rate limit em {path}: espera de {delay:.0f}s passa do prazo da coleta")
+                self.logger.warning(f"Rate limit atingido, aguardando {delay:.0f}s")
+                self.rate_limiter.sleep(delay)
+                continue
+
+            if status == 404:
+                return None
+
+            if status >= 500:
+                self.logger.warning(f"Tentativa {attempt + 1} falhou para {path}: HTTP {status}")
+                self.rate_limiter.sleep(self._capped(2 ** attempt))
+                continue
+
+            if status != 200:
+                raise DiscogsScraperError(f"Erro HTTP {status} em {path}")
+
+            payload = json.loads(body)
+            etag = headers.get('ETag')
+            last_modified = headers.get('Last-Modified')
+            if self.http_cache is not None and (etag or last_modified):
+                self.http_cache.put(path, etag, last_modified, body)
+            return payload
+
+        raise DiscogsScraperError(f"Falha ao acessar {path} após {self.max_retries} tentativas")
+
+    def search_artists_by_genre(self, genre: str, limit: int = 10) -> List[str]:
+        # A busca da API não filtra artistas por gênero: buscamos masters do gênero e usamos o artista principal
+        genre_capitalized = genre.capitalize()
+        self.logger.info(f"Buscando artistas do gênero via API: {genre}")
+
+        artist_urls: List[str] = []
+        page = 1
+        while len(artist_urls) < limit:
+            data = self._get_json('/database/search', {
+                'genre': genre_capitalized, 'type': 'master', 'per_page': 50, 'page': page
+            })
+            results = (data or {}).get('results', [])
+            if not results:
+                break
+
+            for result in results:
+                if len(artist_urls) >= limit:
+                    break
+                master = self._get_json(f"/masters/{result['id']}")
+                artists = (master or {}).get('artists') or []
+                if not artists or not artists[0].get('id'):
+                    continue
+                artist_url = f"{self.base_url}/artist/{artists[0]['id']}"
+                if artist_url not in artist_urls:
+                    artist_urls.append(artist_url)
+
+            pages = (data.get('pagination') or {}).get('pages', page)
+            if page >= pages:
+                break
+            page += 1
+
+        self.logger.info(f"Encontrados {len(artist_urls)} artistas")
+        return artist_urls
+
+    def scrape_artist_info(self, artist_url: str, genre: str, include_albums: bool = True) -> Optional[Artist]:
+        artist_id = discogs_id_from_url(artist_url)
+        if not artist_id:
+            return None
+
+        data = self._get_json(f"/artists/{artist_id}")
+        if not data:
+            return None
+
+        artist_name = data.get('name', "Nome não encontrado")
+        members, member_ids = [], []
+        for member in data.get('members') or []:
+            if member.get('name') and member.get('name') != artist_name:
+                members.append(member['name'])
+                member_ids.append(f"discogs-artist-{member['id']}" if member.get('id') else None)
+
+        group_ids = [f"discogs-artist-{group['id']}" for group in data.get('groups') or [] if group.get('id')]
+
+        websites = []
+        for url in data.get('urls') or []:
+            if url and 'discogs' not in url.lower() and url not in websites:
+                websites.append(url)
+
+        artist = Artist(
+            name=artist_name,
+            genre=genre,
+            members=members,
+            websites=websites,
+            url=artist_url,
+            member_ids=member_ids,
+            group_ids=group_ids
+        )
+
+        if include_albums:
+            self._scrape_artist_albums(artist, artist_url)
+
+        return artist
+
+    def list_artist_album_urls(self, artist_url: str, max_albums: int = MAX_ALBUMS_PER_ARTIST) -> List[str]:
+        artist_id = discogs_id_from_url(artist_url)
+        if not artist_id:
+            return []
+
+        data = self._get_json(f"/artists/{artist_id}/releases", {
+            'sort': 'year', 'sort_order': 'asc', 'per_page': 100
+        })
+
+        album_urls: List[str] = []
+        for release in (data or {}).get('releases', []):
+            if len(album_urls) >= max_albums:
+                break
+            if release.get('role') != 'Main':
+                continue
+            # Masters já agrupam as prensagens: usamos o release principal de cada um
+            release_id = release.get('main_release') if release.get('type') == 'master' else release.get('id')
+            if not release_id:
+                continue
+            album_url = f"{self.base_url}/release/{release_id}"
+            if album_url in album_urls or not self._is_album(release, str(release_id)):
+                continue
+            album_urls.append(album_url)
+
+        self.logger.info(f"Encontrados {len(album_urls)} álbuns")
+        return album_urls
+
+    def _is_album(self, release: Dict[str, Any], release_id: str) -> bool:
+        # Releases trazem o formato na listagem ("CD, Album"); masters não, então checamos o release principal
+        if release.get('format'):
+            return is_album_format(release['format'].split(','))
+
+        data = self._get_json(f"/releases/{release_id}")
+        if not data:
+            return False
+        descriptions = [description for fmt in data.get('formats') or []
+                        for description in fmt.get('descriptions') or []]
+        if not is_album_format(descriptions):
+            return False
+        # Só releases aceitos são coletados depois; os rejeitados nunca seriam consumidos
+        self._release_payloads[release_id] = data
+        while len(self._release_payloads) > self.cache_size:
+            self._release_payloads.popitem(last=False)
+        return True
+
+    def scrape_album_details(self, album_url: str) -> Optional[Album]:
+        release_id = discogs_id_from_url(album_url, 'release')
+        if not release_id:
+            return None
+
+        data = self._release_payloads.pop(release_id, None) or self._get_json(f"/releases/{release_id}")
+        if not data:
+            return None
+
+        labels = data.get('labels') or []
+        label = labels[0].get('name') if labels else None
+
+        tracks = []
+        for track_data in data.get('tracklist') or []:
+            if track_data.get('type_', 'track') != 'track':
+                continue
+            position = str(track_data.get('position') or '')
+            track_number = int(position) if position.isdigit() else len(tracks) + 1
+            tracks.append(Track(
+                number=track_number,
+                title=track_data.get('title', 'Track sem título'),
+                duration=track_data.get('duration') or ''
+            ))
+
+        return Album(
+            name=data.get('title', 'Álbum sem nome'),
+            year=data.get('year') or None,
+            label=label,
+            styles=[style for style in data.get('styles') or [] if isinstance(style, str)],
+            tracks=tracks,
+            url=album_url
+        )
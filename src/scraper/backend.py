@@ -0,0 +1,168 @@
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import List, Optional
+
+from .data_models import Artist, Album
+from .entity_cache import EntityCache, discogs_id_from_url
+from .scheduler import CrawlBudget, run_scheduled_crawl
+from settings import GRAPH_CRAWL_DEPTH, MAX_ALBUMS_PER_ARTIST, SCHEDULER_TOP_RELEASES
+
+
+class DiscogsScraperError(Exception):
+    pass
+
+
+class DeadlineExceededError(DiscogsScraperError):
+    pass
+
+
+class ScraperBackend(ABC):
+    """
+    Interface comum das fontes de dados do Discogs (navegador ou API oficial).
+    Backends implementam busca, perfil, discografia e detalhes de álbum;
+    a orquestração da coleta (sequencial, grafo de membros ou com orçamento) é compartilhada.
+    Artistas e álbuns são sempre identificados pelas URLs do site (/artist/N, /release/N).
+    """
+    def __init__(self, base_url: str = "https://www.discogs.com", entity_cache: Optional[EntityCache] = None):
+        self.base_url = base_url
+        self.entity_cache = entity_cache if entity_cache is not None else EntityCache()
+        self.profiler = None
+        # Orçamento da coleta em andamento: limita retries, esperas e timeouts das requisições
+        self.budget: Optional[CrawlBudget] = None
+        self.logger = logging.getLogger(self.__class__.__module__)
+
+    @abstractmethod
+    def search_artists_by_genre(self, genre: str, limit: int = 10) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def scrape_artist_info(self, artist_url: str, genre: str, include_albums: bool = True) -> Optional[Artist]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_artist_album_urls(self, artist_url: str, max_albums: int = MAX_ALBUMS_PER_ARTIST) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def scrape_album_details(self, album_url: str) -> Optional[Album]:
+        raise NotImplementedError
+
+    def _scrape_artist_albums(self, artist: Artist, artist_url: str, max_albums: int = MAX_ALBUMS_PER_ARTIST) -> None:
+        for album_url in self.list_artist_album_urls(artist_url, max_albums):
+            album = self.scrape_album_details(album_url)
+            if album:
+                artist.add_album(album)
+
+    def _time_left(self) -> Optional[float]:
+        return self.budget.time_left() if self.budget is not None else None
+
+    def _capped(self, seconds: float) -> float:
+        """Limita uma espera ou timeout ao tempo restante do prazo da coleta"""
+        time_left = self._time_left()
+        return seconds if time_left is None else min(seconds, time_left)
+
+    def _check_deadline(self, target: str) -> None:
+        time_left = self._time_left()
+        if time_left is not None and time_left <= 0:
+            raise DeadlineExceededError(f"Prazo da coleta esgotado antes de acessar {target}")
+
+    def _mark_stage(self, label: str) -> None:
+        if self.profiler is not None:
+            self.profiler.snapshot(label)
+
+    def _scrape_artist_cached(self, artist_url: str, genre: str) -> Optional[Artist]:
+        discogs_id = discogs_id_from_url(artist_url)
+        if not discogs_id:
+            return self.scrape_artist_info(artist_url, genre)
+        return self.entity_cache.get_or_load(
+            discogs_id, lambda: self.scrape_artist_info(artist_url, genre)
+        )
+
+    def crawl_artist_graph(self, seed_urls: List[str], genre: str, max_depth: int = GRAPH_CRAWL_DEPTH) -> List[Artist]:
+        """
+        Crawl em largura a partir dos artistas semente, seguindo membros e grupos
+        até max_depth níveis. Cada artista é coletado uma única vez via entity_cache.
+        """
+        artists = []
+        visited = set()
+        queue = deque((url, 0) for url in seed_urls)
+
+        while queue:
+            artist_url, depth = queue.popleft()
+            discogs_id = discogs_id_from_url(artist_url) or artist_url
+            if discogs_id in visited:
+                continue
+            visited.add(discogs_id)
+
+            # O gênero da busca só vale para as sementes; artistas alcançados por membros/grupos ficam sem gênero
+            artist_genre = genre if depth == 0 else ""
+            try:
+                artist = self._scrape_artist_cached(artist_url, artist_genre)
+            except Exception as e:
+                self.logger.error(f"Erro ao coletar dados do artista {artist_url}: {e}")
+                continue
+
+            if not artist:
+                continue
+
+            artists.append(artist)
+            self.logger.info(f"Coletado: {artist.name} com {len(artist.albums)} álbum(s) (profundidade {depth})")
+            self._mark_stage(f"artista: {artist.name}")
+
+            if depth >= max_depth:
+                continue
+
+            for related_id in artist.member_ids + artist.group_ids:
+                if not related_id:
+                    continue
+                related_discogs_id = related_id.rsplit('-', 1)[-1]
+                if related_discogs_id not in visited:
+                    queue.append((f"{self.base_url}/artist/{related_discogs_id}", depth + 1))
+
+        self.logger.info(f"Cache de entidades: {self.entity_cache.stats()}")
+        return artists
+
+    def scrape_genre_data(self, genre: str, max_artists: int = 10, graph_depth: int = GRAPH_CRAWL_DEPTH,
+                          budget: Optional[CrawlBudget] = None) -> List[Artist]:
+        self.logger.info(f"Iniciando coleta de dados para o gênero: {genre}")
+
+        artist_urls = self.search_artists_by_genre(genre, max_artists)
+        self._mark_stage("busca")
+
+        if budget is not None:
+            budget.consume_page()
+            if graph_depth > 0:
+                self.logger.warning("Crawl de membros/grupos é ignorado quando há prazo/orçamento de páginas")
+            self.budget = budget
+            try:
+                artists = run_scheduled_crawl(
+                    self, artist_urls, genre, budget,
+                    top_releases=SCHEDULER_TOP_RELEASES, max_albums=MAX_ALBUMS_PER_ARTIST,
+                    on_stage=self._mark_stage
+                )
+            finally:
+                self.budget = None
+            self.logger.info(f"Coleta finalizada. Total de artistas: {len(artists)}")
+            return artists
+
+        if graph_depth > 0:
+            artists = self.crawl_artist_graph(artist_urls, genre, graph_depth)
+            self.logger.info(f"Coleta finalizada. Total de artistas: {len(artists)}")
+            return artists
+
+        artists = []
+        for artist_url in artist_urls:
+            try:
+                artist = self._scrape_artist_cached(artist_url, genre)
+                if artist:  
+                    artists.append(artist)
+                    self.logger.info(f"Coletado: {artist.name} com {len(artist.albums)} álbum(s)")
+                    self._mark_stage(f"artista: {artist.name}")
+
+            except Exception as e:
+                self.logger.error(f"Erro ao coletar dados do artista {artist_url}: {e}")
+                continue
+
+        self.logger.info(f"Coleta finalizada. Total de artistas: {len(artists)}")
+        return artists
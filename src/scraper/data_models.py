@@ -37,11 +37,11 @@ class Album:
     
     def to_dict(self) -> Dict:
         return {
-            'album_id': self.album_id,
+            'id': self.album_id,
             'name': self.name,
             'year': self.year,
             'label': self.label,
-            'styles': self.styles,
+            'styles': self.styles if self.styles else [],
             'tracks': [track.to_dict() for track in self.tracks]
         }
 
@@ -53,6 +53,8 @@ class Artist:
     websites: List[str] = field(default_factory=list)
     albums: List[Album] = field(default_factory=list)
     url: Optional[str] = None
+    member_ids: List[Optional[str]] = field(default_factory=list)  # alinhado com members, None se sem id
+    group_ids: List[str] = field(default_factory=list)
     
     @property
     def artist_id(self) -> str:
@@ -70,11 +72,17 @@ class Artist:
             self.albums.append(album)
     
     def to_dict(self) -> Dict:
+        # Schema único de saída (JSONL, shards e demais sinks)
         return {
-            'artist_id': self.artist_id,
+            'id': self.artist_id,
             'name': self.name,
             'genre': self.genre,
-            'members': self.members,
-            'websites': self.websites,
+            'members': self.members if self.members else [],
+            'member_ids': self.member_ids if self.member_ids else [],
+            'group_ids': self.group_ids if self.group_ids else [],
+            'websites': [
+                w for w in self.websites
+                if w and 'discogs' not in w.lower()
+            ],
             'albums': [album.to_dict() for album in self.albums]
         }
\ No newline at end of file
@@ -0,0 +1,273 @@
+import logging
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    import psutil
+except ImportError:  # psutil é opcional; no Linux usamos /proc
+    psutil = None
+
+
+# Com prazo de coleta, driver.get em andamento é verificado a cada intervalo (SIGTERM aborta a página)
+DEADLINE_POLL_INTERVAL = 1.0
+
+
+class DriverHangError(Exception):
+    pass
+
+
+class DriverDeadlineError(DriverHangError):
+    pass
+
+
+def _children_map_from_proc() -> Dict[int, List[int]]:
+    """ppid -> pids filhos, lendo cada /proc/<pid>/stat uma única vez"""
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return children
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                # O nome do processo pode conter espaços: o ppid vem após o último ')'
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def descendant_pids(pids: Iterable[int]) -> List[int]:
+    """Todos os descendentes dos pids informados (sem repetição, sem os próprios pids)"""
+    roots = list(pids)
+    found: List[int] = []
+    seen = set(roots)
+
+    if psutil is not None:
+        for pid in roots:
+            try:
+                children = psutil.Process(pid).children(recursive=True)
+            except psutil.Error:
+                continue
+            for child in children:
+                if child.pid not in seen:
+                    seen.add(child.pid)
+                    found.append(child.pid)
+        return found
+
+    children_map = _children_map_from_proc()
+    stack = list(roots)
+    while stack:
+        for child in children_map.get(stack.pop(), []):
+            if child not in seen:
+                seen.add(child)
+                found.append(child)
+                stack.append(child)
+    return found
+
+
+def _rss_bytes(pid: int) -> int:
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return 0
+    return _rss_from_proc(pid)
+
+
+def _rss_from_proc(pid: int) -> int:
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def process_tree_rss_mb(*pids: int) -> float:
+    """RSS total (MB) dos processos e seus descendentes (cada processo contado uma vez), 0 se não for possível medir"""
+    if psutil is None and not os.path.exists('/proc'):
+        return 0.0
+    roots = list(dict.fromkeys(pids))
+    total = sum(_rss_bytes(pid) for pid in roots + descendant_pids(roots))
+    return total / (1024 * 1024)
+
+
+class DriverManager:
+    """
+    Controla o ciclo de vida do WebDriver: recria o navegador a cada max_pages
+    páginas ou quando o RSS do Chrome passa de max_rss_mb, e aplica um timeout
+    rígido em driver.get. Se o navegador travar, o processo é morto, um novo
+    driver é criado e a URL em andamento é tentada novamente.
+    Com time_left (segundos até o prazo da coleta), o carregamento é abortado no prazo, sem novas tentativas.
+    """
+    def __init__(self, factory: Callable[[], Any], max_pages: int = 200, max_rss_mb: float = 1500,
+                 page_load_timeout: float = 60, hang_timeout: float = 90, max_hang_retries: int = 2,
+                 teardown: Optional[Callable[[Any], None]] = None,
+                 time_left: Optional[Callable[[], Optional[float]]] = None):
+        self.factory = factory
+        self.teardown = teardown
+        self.time_left = time_left
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.page_load_timeout = page_load_timeout
+        self.hang_timeout = hang_timeout
+        self.max_hang_retries = max_hang_retries
+        self.logger = logging.getLogger(__name__)
+
+        self._driver = None
+        self.pages_since_start = 0
+        self.restarts = 0
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            self.start()
+        return self._driver
+
+    def start(self) -> None:
+        self._driver = self.factory()
+        self.pages_since_start = 0
+        try:
+            # Timeout do próprio Selenium; o hang_timeout cobre travamentos que ele não detecta
+            self._driver.set_page_load_timeout(self.page_load_timeout)
+        except Exception as e:
+            self.logger.debug(f"Não foi possível definir page_load_timeout: {e}")
+
+    def _driver_pids(self) -> List[int]:
+        pids = []
+        browser_pid = getattr(self._driver, 'browser_pid', None)
+        if browser_pid:
+            pids.append(browser_pid)
+        service = getattr(self._driver, 'service', None)
+        process = getattr(service, 'process', None)
+        if process is not None and getattr(process, 'pid', None):
+            pids.append(process.pid)
+        return pids
+
+    def rss_mb(self) -> float:
+        if self._driver is None:
+            return 0.0
+        # Uma única varredura da árvore: o Chrome pode ser filho do chromedriver e não é contado duas vezes
+        return process_tree_rss_mb(*self._driver_pids())
+
+    def _run_teardown(self, driver) -> None:
+        if self.teardown is None:
+            return
+        try:
+            self.teardown(driver)
+        except Exception as e:
+            self.logger.warning(f"Erro ao liberar recursos do WebDriver: {e}")
+
+    def quit(self) -> None:
+        if self._driver is None:
+            return
+        try:
+            self._driver.quit()
+        except Exception:
+            pass
+        self._run_teardown(self._driver)
+        self._driver = None
+
+    def kill(self) -> None:
+        """Encerra o navegador à força, sem depender da sessão WebDriver (que pode estar travada)"""
+        if self._driver is None:
+            return
+        pids = self._driver_pids()
+        # Filhos primeiro (renderers, GPU), antes que virem órfãos do processo principal
+        for target in descendant_pids(pids) + pids:
+            try:
+                os.kill(target, signal.SIGKILL)
+            except OSError:
+                pass
+        driver = self._driver
+        self._driver = None
+        self._run_teardown(driver)
+        threading.Thread(target=lambda: self._quietly_quit(driver), daemon=True).start()
+
+    def _quietly_quit(self, driver) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def restart(self, reason: str) -> None:
+        self.logger.info(f"Reiniciando WebDriver ({reason}) após {self.pages_since_start} páginas")
+        self.quit()
+        self.restarts += 1
+        self.start()
+
+    def _recycle_if_needed(self) -> None:
+        if self._driver is None:
+            return
+        if self.max_pages and self.pages_since_start >= self.max_pages:
+            self.restart(f"limite de {self.max_pages} páginas")
+            return
+        if self.max_rss_mb:
+            rss = self.rss_mb()
+            if rss > self.max_rss_mb:
+                self.restart(f"RSS {rss:.0f}MB acima de {self.max_rss_mb}MB")
+
+    def _time_left(self) -> Optional[float]:
+        return self.time_left() if self.time_left is not None else None
+
+    def _get_with_deadline(self, url: str) -> None:
+        time_left = self._time_left()
+        if time_left is not None and time_left <= 0:
+            raise DriverDeadlineError(f"Prazo da coleta esgotado antes de carregar {url}")
+
+        driver = self.driver
+        outcome = {}
+
+        def load():
+            try:
+                driver.get(url)
+            except BaseException as e:
+                outcome['error'] = e
+
+        thread = threading.Thread(target=load, daemon=True)
+        thread.start()
+        hang_at = time.monotonic() + self.hang_timeout
+        while thread.is_alive():
+            wait = hang_at - time.monotonic()
+            if wait <= 0:
+                raise DriverHangError(f"driver.get travou por mais de {self.hang_timeout}s em {url}")
+            time_left = self._time_left()
+            if time_left is not None:
+                if time_left <= 0:
+                    raise DriverDeadlineError(f"Prazo da coleta esgotado durante o carregamento de {url}")
+                wait = min(wait, time_left, DEADLINE_POLL_INTERVAL)
+            thread.join(wait)
+
+        if 'error' in outcome:
+            raise outcome['error']
+
+    def get(self, url: str):
+        """Carrega a URL e retorna o driver ativo, reciclando o navegador quando necessário"""
+        self._recycle_if_needed()
+
+        for attempt in range(self.max_hang_retries + 1):
+            try:
+                self._get_with_deadline(url)
+                self.pages_since_start += 1
+                return self._driver
+            except DriverDeadlineError as e:
+                # Prazo esgotado: libera o navegador ocupado e não tenta de novo
+                self.logger.warning(str(e))
+                self.kill()
+                raise
+            except DriverHangError as e:
+                self.logger.warning(f"{e}; matando navegador e recriando (tentativa {attempt + 1})")
+                self.kill()
+                self.restarts += 1
+                if attempt == self.max_hang_retries:
+                    raise
+                self.start()
@@ -0,0 +1,66 @@
+import re
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+def discogs_id_from_url(url: str, entity: str = "artist") -> Optional[str]:
+    # Formato: /artist/12345-Nome ou /release/12345-Nome
+    match = re.search(rf'/{entity}/(\d+)', url or '')
+    return match.group(1) if match else None
+
+
+class EntityCache:
+    """
+    Cache em processo de entidades já coletadas, indexado pelo discogsId.
+    Compartilhado entre as etapas do crawl para que cada artista seja
+    buscado e processado uma única vez, independente de quantos grupos o referenciam.
+    """
+    def __init__(self):
+        self._entities: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, discogs_id: str) -> bool:
+        return str(discogs_id) in self._entities
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def get(self, discogs_id: str) -> Optional[Any]:
+        return self._entities.get(str(discogs_id))
+
+    def put(self, discogs_id: str, entity: Any) -> None:
+        with self._lock:
+            self._entities[str(discogs_id)] = entity
+
+    def get_or_load(self, discogs_id: str, loader: Callable[[], Any]) -> Optional[Any]:
+        key = str(discogs_id)
+        with self._lock:
+            if key in self._entities:
+                self.hits += 1
+                return self._entities[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Lock por chave: carregamentos concorrentes da mesma entidade esperam o primeiro
+        with key_lock:
+            with self._lock:
+                if key in self._entities:
+                    self.hits += 1
+                    return self._entities[key]
+                self.misses += 1
+
+            entity = loader()
+            # Falhas (None) também são cacheadas para não repetir páginas quebradas
+            with self._lock:
+                self._entities[key] = entity
+                self._key_locks.pop(key, None)
+            return entity
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'entities': len(self._entities),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional, Tuple
+
+# (etag, last_modified, corpo da resposta)
+CacheEntry = Tuple[Optional[str], Optional[str], bytes]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    path TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    stored_at REAL NOT NULL
+);
+"""
+
+
+class HttpCache:
+    """
+    Validadores (ETag/Last-Modified) e corpos das respostas da API em SQLite, indexados pelo path.
+    Persiste entre execuções para que as re-coletas enviem requisições condicionais e recebam 304.
+    Cada operação abre sua própria conexão, então vários workers do mesmo host podem compartilhar o arquivo.
+    """
+    def __init__(self, db_path: str, clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self.clock = clock
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, path: str) -> Optional[CacheEntry]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT etag, last_modified, body FROM http_cache WHERE path = ?", (path,)
+            ).fetchone()
+        return (row[0], row[1], bytes(row[2])) if row else None
+
+    def put(self, path: str, etag: Optional[str], last_modified: Optional[str], body: bytes) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO http_cache (path, etag, last_modified, body, stored_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (path, etag, last_modified, sqlite3.Binary(body), self.clock())
+            )
+
+    def delete(self, path: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM http_cache WHERE path = ?", (path,))
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0]
@@ -0,0 +1,178 @@
+import hmac
+import json
+import logging
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from .work_queue import WorkQueue, WorkItem, SQLiteWorkQueue
+
+
+class WorkQueueServiceError(Exception):
+    pass
+
+
+# Operações da WorkQueue expostas pela API HTTP (POST /<operação> com os argumentos em JSON)
+QUEUE_OPERATIONS = ('enqueue', 'claim', 'renew', 'complete', 'fail', 'requeue_expired',
+                    'heartbeat', 'workers', 'stats')
+
+
+class _QueueRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        self.server.logger.debug(f"{self.address_string()} {format % args}")
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        token = self.server.token
+        if token and not hmac.compare_digest(self.headers.get('Authorization', ''), f"Bearer {token}"):
+            self._send_json(401, {'error': 'token inválido'})
+            return
+
+        operation = self.path.strip('/')
+        if operation not in QUEUE_OPERATIONS:
+            self._send_json(404, {'error': f"operação desconhecida: {operation}"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            kwargs = json.loads(self.rfile.read(length) or b'{}')
+            result = getattr(self.server.queue, operation)(**kwargs)
+        except (TypeError, ValueError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            self.server.logger.error(f"Erro na operação {operation} da fila: {e}")
+            self._send_json(500, {'error': str(e)})
+            return
+
+        if isinstance(result, WorkItem):
+            result = asdict(result)
+        self._send_json(200, {'result': result})
+
+
+class WorkQueueServer:
+    """
+    Serviço HTTP do coordinator: expõe a fila SQLite local para workers em outros hosts.
+    O SQLite fica apenas no disco do coordinator; os workers usam HttpWorkQueue.
+    """
+    def __init__(self, queue: WorkQueue, host: str = '127.0.0.1', port: int = 8765, token: Optional[str] = None):
+        self.queue = queue
+        self.logger = logging.getLogger(__name__)
+        self._server = ThreadingHTTPServer((host, port), _QueueRequestHandler)
+        self._server.daemon_threads = True
+        self._server.queue = queue
+        self._server.token = token
+        self._server.logger = self.logger
+        self._thread: Optional[threading.Thread] = None
+
+        if not token and host not in ('127.0.0.1', 'localhost', '::1'):
+            self.logger.warning("Fila exposta na rede sem token (WORK_QUEUE_TOKEN)")
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    @property
+    def url(self) -> str:
+        host, port = self.address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self.logger.info(f"Fila de trabalho servida em {self.url}")
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+class HttpWorkQueue(WorkQueue):
+    """Cliente da fila servida por WorkQueueServer; leases e tentativas continuam no coordinator"""
+    def __init__(self, base_url: str, token: Optional[str] = None, timeout: float = 30,
+                 max_retries: int = 3, retry_delay: float = 1.0):
+        self.base_url = base_url.rstrip('/')
+        self.token = token
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+    def _call(self, operation: str, **kwargs) -> Any:
+        request = urllib.request.Request(
+            f"{self.base_url}/{operation}",
+            data=json.dumps(kwargs, ensure_ascii=False).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        if self.token:
+            request.add_header('Authorization', f"Bearer {self.token}")
+
+        for attempt in range(self.max_retries):
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return json.loads(response.read())['result']
+            except urllib.error.HTTPError as e:
+                detail = json.loads(e.read() or b'{}').get('error', e.reason)
+                raise WorkQueueServiceError(f"{operation}: HTTP {e.code} ({detail})")
+            except (urllib.error.URLError, OSError) as e:
+                # Falha de conexão: o coordinator pode estar reiniciando
+                if attempt == self.max_retries - 1:
+                    raise WorkQueueServiceError(f"{operation}: coordinator inacessível ({e})")
+                time.sleep(self.retry_delay * (2 ** attempt))
+
+    def enqueue(self, kind: str, url: str, payload: Optional[Dict[str, Any]] = None) -> bool:
+        return self._call('enqueue', kind=kind, url=url, payload=payload)
+
+    def claim(self, worker_id: str, lease_seconds: float, kinds: Optional[List[str]] = None) -> Optional[WorkItem]:
+        item = self._call('claim', worker_id=worker_id, lease_seconds=lease_seconds, kinds=kinds)
+        return WorkItem(**item) if item else None
+
+    def renew(self, item_id: int, worker_id: str, lease_seconds: float) -> bool:
+        return self._call('renew', item_id=item_id, worker_id=worker_id, lease_seconds=lease_seconds)
+
+    def complete(self, item_id: int, worker_id: str) -> bool:
+        return self._call('complete', item_id=item_id, worker_id=worker_id)
+
+    def fail(self, item_id: int, worker_id: str, error: str, max_attempts: int = 3) -> None:
+        self._call('fail', item_id=item_id, worker_id=worker_id, error=error, max_attempts=max_attempts)
+
+    def requeue_expired(self) -> int:
+        return self._call('requeue_expired')
+
+    def heartbeat(self, worker_id: str, stats: Dict[str, Any]) -> None:
+        self._call('heartbeat', worker_id=worker_id, stats=stats)
+
+    def workers(self) -> List[Dict[str, Any]]:
+        return self._call('workers')
+
+    def stats(self) -> Dict[str, int]:
+        return self._call('stats')
+
+
+def open_work_queue(location: str, token: Optional[str] = None) -> WorkQueue:
+    """URL http(s):// -> fila remota de um coordinator; caminho -> arquivo SQLite local"""
+    if location.startswith(('http://', 'https://')):
+        return HttpWorkQueue(location, token)
+    return SQLiteWorkQueue(location)
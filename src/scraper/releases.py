@@ -0,0 +1,121 @@
+import re
+from typing import Dict, List, Optional
+
+RELEASE_SELECTION_STRATEGIES = ("earliest", "main", "most_tracks")
+
+
+def _discogs_id_from_key(ref_key: str) -> Optional[str]:
+    # Chaves do dsdata seguem o formato: 'Release:{"discogsId":123}'
+    match = re.search(r'"discogsId"\s*:\s*(\d+)', ref_key or '')
+    return match.group(1) if match else None
+
+
+def _resolve_ref(value, data: Dict) -> Optional[Dict]:
+    if isinstance(value, dict) and '__ref' in value:
+        return data.get(value['__ref'])
+    if isinstance(value, dict):
+        return value
+    return None
+
+
+def _ref_key(value) -> Optional[str]:
+    if isinstance(value, dict):
+        return value.get('__ref')
+    return None
+
+
+def get_master_id(release_data: Dict, data: Dict) -> Optional[str]:
+    for field_name in ('masterRelease', 'master'):
+        value = release_data.get(field_name)
+        if value is None:
+            continue
+
+        ref_key = _ref_key(value)
+        if ref_key:
+            master_id = _discogs_id_from_key(ref_key)
+            if master_id:
+                return master_id
+
+        master = _resolve_ref(value, data)
+        if master and master.get('discogsId') is not None:
+            return str(master['discogsId'])
+
+    master_id = release_data.get('masterId')
+    return str(master_id) if master_id else None
+
+
+def _release_year(release_data: Dict) -> int:
+    released = release_data.get('released') or release_data.get('year')
+    if released:
+        try:
+            return int(str(released).split('-')[0])
+        except ValueError:
+            pass
+    # Releases sem data vão para o final na estratégia "earliest"
+    return 9999
+
+
+def _track_count(release_data: Dict) -> int:
+    tracks = release_data.get('tracks')
+    if isinstance(tracks, list):
+        return len(tracks)
+    try:
+        return int(release_data.get('trackCount') or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _main_release_key(master_id: str, data: Dict) -> Optional[str]:
+    master = None
+    for key in data.keys():
+        if key.startswith('MasterRelease:') and _discogs_id_from_key(key) == master_id:
+            master = data[key]
+            break
+    if not master:
+        return None
+
+    for field_name in ('mainRelease', 'keyRelease'):
+        ref_key = _ref_key(master.get(field_name))
+        if ref_key:
+            return ref_key
+    return None
+
+
+def select_canonical_releases(data: Dict, release_keys: List[str], max_albums: int,
+                              strategy: str = "main") -> List[str]:
+    """
+    Agrupa os releases do dsdata por master e escolhe um release canônico por master,
+    antes de qualquer carregamento de página. Releases sem master formam grupo próprio.
+    Retorna no máximo max_albums chaves, na ordem em que cada master apareceu.
+    """
+    if strategy not in RELEASE_SELECTION_STRATEGIES:
+        raise ValueError(f"Estratégia de seleção inválida: {strategy}")
+
+    groups: Dict[str, List[str]] = {}
+    for key in release_keys:
+        release_data = data.get(key) or {}
+        master_id = get_master_id(release_data, data)
+        group_key = f"master-{master_id}" if master_id else f"release-{key}"
+        groups.setdefault(group_key, []).append(key)
+
+    selected = []
+    for group_key, keys in groups.items():
+        if len(selected) >= max_albums:
+            break
+
+        if len(keys) == 1:
+            selected.append(keys[0])
+            continue
+
+        if strategy == "earliest":
+            # min() é estável: em empate fica o primeiro da listagem
+            chosen = min(keys, key=lambda k: _release_year(data.get(k) or {}))
+        elif strategy == "most_tracks":
+            chosen = max(keys, key=lambda k: _track_count(data.get(k) or {}))
+        else:
+            main_key = _main_release_key(group_key[len("master-"):], data)
+            chosen = main_key if main_key in keys else keys[0]
+
+        selected.append(chosen)
+
+    return selected
@@ -0,0 +1,157 @@
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from .data_models import Artist
+
+# Fases em ordem de prioridade: primeiro cobertura (todo artista recebe perfil e
+# principais releases), depois preenchimento com o restante das discografias
+PHASE_PROFILE = 0
+PHASE_DISCOGRAPHY = 1
+PHASE_TOP_RELEASES = 2
+PHASE_REMAINING_RELEASES = 3
+
+PHASE_NAMES = {
+    PHASE_PROFILE: "perfis",
+    PHASE_DISCOGRAPHY: "discografias",
+    PHASE_TOP_RELEASES: "releases principais",
+    PHASE_REMAINING_RELEASES: "demais releases",
+}
+
+
+class CrawlBudget:
+    """Orçamento da coleta: prazo em segundos e/ou número máximo de páginas carregadas"""
+    def __init__(self, deadline_seconds: Optional[float] = None, page_budget: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.deadline_seconds = deadline_seconds
+        self.page_budget = page_budget
+        self.clock = clock
+        self.started_at = clock()
+        self.pages_used = 0
+        self.cancelled = False
+
+    def consume_page(self) -> None:
+        self.pages_used += 1
+
+    def cancel(self) -> None:
+        # Usado pelo handler de SIGTERM: a página atual é abortada e a coleta encerra com o que já tem
+        self.cancelled = True
+
+    def remaining_seconds(self) -> Optional[float]:
+        if self.deadline_seconds is None:
+            return None
+        return self.deadline_seconds - (self.clock() - self.started_at)
+
+    def time_left(self) -> Optional[float]:
+        """Segundos até o prazo, usados para limitar timeouts e esperas da tarefa em andamento (0 se cancelada)"""
+        if self.cancelled:
+            return 0.0
+        remaining = self.remaining_seconds()
+        return None if remaining is None else max(remaining, 0.0)
+
+    def remaining_pages(self) -> Optional[int]:
+        if self.page_budget is None:
+            return None
+        return self.page_budget - self.pages_used
+
+    def exhausted(self) -> bool:
+        if self.cancelled:
+            return True
+        remaining_seconds = self.remaining_seconds()
+        if remaining_seconds is not None and remaining_seconds <= 0:
+            return True
+        remaining_pages = self.remaining_pages()
+        return remaining_pages is not None and remaining_pages <= 0
+
+
+class CrawlScheduler:
+    """Fila de prioridade de tarefas (fase, rank); cada tarefa custa uma página"""
+    def __init__(self):
+        self._heap: List[Tuple[int, Any, int, str, tuple]] = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, phase: int, rank: Any, kind: str, *args) -> None:
+        heapq.heappush(self._heap, (phase, rank, next(self._counter), kind, args))
+
+    def pop(self) -> Tuple[int, str, tuple]:
+        phase, _, _, kind, args = heapq.heappop(self._heap)
+        return phase, kind, args
+
+
+def run_scheduled_crawl(scraper, artist_urls: List[str], genre: str, budget: CrawlBudget,
+                        top_releases: int = 3, max_albums: int = 10,
+                        on_stage: Optional[Callable[[str], None]] = None) -> List[Artist]:
+    """
+    Executa a coleta em ordem de prioridade até o orçamento acabar.
+    Perfis de todos os artistas vêm primeiro, depois as discografias, depois os
+    top_releases de cada artista (em rodízio entre artistas) e por fim o restante.
+    Sempre retorna os artistas coletados até o momento, prontos para exportação.
+    on_stage(label) é chamado ao fim de cada fase e após cada perfil (snapshots do --profile).
+    """
+    logger = logging.getLogger(__name__)
+    scheduler = CrawlScheduler()
+    artists: List[Optional[Artist]] = [None] * len(artist_urls)
+
+    for index, artist_url in enumerate(artist_urls):
+        scheduler.push(PHASE_PROFILE, index, 'profile', index, artist_url)
+
+    def mark_stage(label: str) -> None:
+        if on_stage is not None:
+            on_stage(label)
+
+    skipped = 0
+    current_phase = None
+    try:
+        while scheduler:
+            if budget.exhausted():
+                skipped = len(scheduler)
+                break
+
+            phase, kind, args = scheduler.pop()
+            if current_phase is not None and phase != current_phase:
+                mark_stage(f"fase: {PHASE_NAMES[current_phase]}")
+            current_phase = phase
+            budget.consume_page()
+
+            try:
+                if kind == 'profile':
+                    index, artist_url = args
+                    artist = scraper.scrape_artist_info(artist_url, genre, include_albums=False)
+                    if artist:
+                        artists[index] = artist
+                        scheduler.push(PHASE_DISCOGRAPHY, index, 'discography', index, artist_url)
+                        mark_stage(f"artista: {artist.name}")
+
+                elif kind == 'discography':
+                    index, artist_url = args
+                    album_urls = scraper.list_artist_album_urls(artist_url, max_albums)
+                    for position, album_url in enumerate(album_urls):
+                        release_phase = PHASE_TOP_RELEASES if position < top_releases else PHASE_REMAINING_RELEASES
+                        # Rank (posição, artista): release n de todos os artistas antes do n+1
+                        scheduler.push(release_phase, (position, index), 'release', index, album_url)
+
+                elif kind == 'release':
+                    index, album_url = args
+                    album = scraper.scrape_album_details(album_url)
+                    if album:
+                        artists[index].add_album(album)
+
+            except Exception as e:
+                logger.error(f"Erro na tarefa {kind} {args[-1]}: {e}")
+
+    except KeyboardInterrupt:
+        skipped = len(scheduler)
+        logger.warning("Coleta interrompida, exportando dados coletados até agora")
+
+    if current_phase is not None:
+        mark_stage(f"fase: {PHASE_NAMES[current_phase]}")
+
+    if skipped:
+        logger.warning(f"Orçamento esgotado ({budget.pages_used} páginas): {skipped} tarefa(s) não executada(s)")
+
+    return [artist for artist in artists if artist is not None]
@@ -5,101 +5,157 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from bs4 import BeautifulSoup
 import time
-import logging
 import platform
 import os
-from typing import List, Optional
+import re
+from typing import List, Optional, Tuple
 from urllib.parse import urljoin
 from .data_models import Artist, Album, Track
+from .releases import select_canonical_releases
+from .entity_cache import EntityCache
+from .backend import ScraperBackend, DiscogsScraperError
+from .driver_manager import DriverManager, DriverHangError
+from .virtual_display import VirtualDisplay
 from src.scraper.data_models import Track
+from settings import (MAX_ALBUMS_PER_ARTIST, RELEASE_SELECTION_STRATEGY,
+                      SELENIUM_PAGE_LOAD_TIMEOUT, DRIVER_MAX_PAGES, DRIVER_MAX_RSS_MB, DRIVER_HANG_TIMEOUT,
+                      VIRTUAL_DISPLAY_SIZE, VIRTUAL_DISPLAY_DEPTH)
 import json
 
-class DiscogsScraperError(Exception):
-    pass
-
-class DiscogsScraper:
-    def __init__(self, base_url: str = "https://www.discogs.com", headless: bool = True):
-        self.base_url = base_url
+class DiscogsScraper(ScraperBackend):
+    def __init__(self, base_url: str = "https://www.discogs.com", headless: bool = True,
+                 release_strategy: str = RELEASE_SELECTION_STRATEGY,
+                 entity_cache: Optional[EntityCache] = None,
+                 virtual_display: bool = False):
+        super().__init__(base_url, entity_cache)
         self.headless = headless
-        self.logger = logging.getLogger(__name__)
+        self.virtual_display = virtual_display and not headless
+        self._displays = {}
+        self.release_strategy = release_strategy
+        
+        self.drivers = DriverManager(
+            self._create_driver,
+            max_pages=DRIVER_MAX_PAGES,
+            max_rss_mb=DRIVER_MAX_RSS_MB,
+            page_load_timeout=SELENIUM_PAGE_LOAD_TIMEOUT,
+            hang_timeout=DRIVER_HANG_TIMEOUT,
+            teardown=self._teardown_driver,
+            time_left=self._time_left
+        )
         
         try:
-            options = uc.ChromeOptions()
-            
-           # Detectar sistema operacional
-            system = platform.system()
-            
-            if system not in ["Windows", "Darwin"]:
-                chromium_paths = [
-                    "/snap/bin/chromium",
-                    "/usr/bin/chromium",
-                    "/usr/bin/chromium-browser",
-                    "/usr/bin/google-chrome"
-                ]
-                
-                for chromium_path in chromium_paths:
-                    if os.path.exists(chromium_path):
-                        options.binary_location = chromium_path
-                        self.logger.info(f"Usando Chrome/Chromium em: {chromium_path}")
-                        break
-            
-            if headless:
-                options.add_argument('--headless=new')
-            
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--window-size=1920,1080')
+            self.drivers.start()
+            self.logger.info("Selenium WebDriver inicializado com sucesso")
+        except Exception as e:
+            raise DiscogsScraperError(f"Erro ao inicializar WebDriver: {e}")
+    
+    @property
+    def driver(self):
+        return self.drivers.driver
+    
+    def _create_driver(self):
+        options = uc.ChromeOptions()
+        
+        # Detectar sistema operacional
+        system = platform.system()
+        
+        if system not in ["Windows", "Darwin"]:
+            chromium_paths = [
+                "/snap/bin/chromium",
+                "/usr/bin/chromium",
+                "/usr/bin/chromium-browser",
+                "/usr/bin/google-chrome"
+            ]
             
-            self.driver = uc.Chrome(
+            for chromium_path in chromium_paths:
+                if os.path.exists(chromium_path):
+                    options.binary_location = chromium_path
+                    self.logger.info(f"Usando Chrome/Chromium em: {chromium_path}")
+                    break
+        
+        if self.headless:
+            options.add_argument('--headless=new')
+        
+        # Um Xvfb por navegador, com resolução e profundidade de cor mínimas
+        display = None
+        window_size = (1920, 1080)
+        if self.virtual_display:
+            display = VirtualDisplay(*VIRTUAL_DISPLAY_SIZE, depth=VIRTUAL_DISPLAY_DEPTH)
+            options.add_argument(f'--display={display.start()}')
+            window_size = VIRTUAL_DISPLAY_SIZE
+        
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-gpu')
+        options.add_argument(f'--window-size={window_size[0]},{window_size[1]}')
+        
+        try:
+            driver = uc.Chrome(
                 options=options,
                 use_subprocess=True
             )
-            
-            self.logger.info("Selenium WebDriver inicializado com sucesso")
-        except Exception as e:
-            raise DiscogsScraperError(f"Erro ao inicializar WebDriver: {e}")
+        except Exception:
+            if display:
+                display.stop()
+            raise
+        
+        if display:
+            self._displays[id(driver)] = display
+        return driver
+    
+    def _teardown_driver(self, driver) -> None:
+        display = self._displays.pop(id(driver), None)
+        if display:
+            display.stop()
     
     def __del__(self):
-        if hasattr(self, 'driver'):
+        if hasattr(self, 'drivers'):
             try:
-                self.driver.quit()
+                self.drivers.quit()
                 self.logger.info("WebDriver fechado")
             except:
                 pass
     
     def _make_request(self, url: str, max_retries: int = 3) -> Optional[BeautifulSoup]:
         for attempt in range(max_retries):
+            # Com --deadline, não começa nova tentativa depois do prazo
+            self._check_deadline(url)
             try:
-                self.logger.debug(f"Acessando: {url}")
-                self.driver.get(url)
+                self.logger.debug("Acessando: %s", url, extra={'url': url, 'stage': 'request'})
+                started_at = time.monotonic()
+                self.drivers.get(url)
                 
-                self.logger.info("Aguardando página carregar...")
-                time.sleep(5)
+                self.logger.info("Aguardando página carregar...", extra={'url': url, 'stage': 'request', 'sampled': True})
+                time.sleep(self._capped(5))
                 
-                WebDriverWait(self.driver, 15).until(
+                WebDriverWait(self.driver, self._capped(15)).until(
                     EC.presence_of_element_located((By.TAG_NAME, "body"))
                 )
                 
                 page_source = self.driver.page_source
                 if 'cloudflare' in page_source.lower() and 'challenge' in page_source.lower():
                     self.logger.warning("Cloudflare challenge ainda ativo, aguardando resolução...")
-                    time.sleep(10)
+                    time.sleep(self._capped(10))
                     page_source = self.driver.page_source
                 
                 soup = BeautifulSoup(page_source, 'html.parser')
                 
                 title = soup.find('title')
                 if title:
-                    self.logger.info(f"Página carregada: {title.get_text()}")
+                    self.logger.info("Página carregada: %s", title.get_text(), extra={
+                        'url': url,
+                        'stage': 'request',
+                        'elapsed_ms': round((time.monotonic() - started_at) * 1000),
+                        'sampled': True
+                    })
                 
                 return soup
 
-            except (TimeoutException, WebDriverException) as e:
+            except (TimeoutException, WebDriverException, DriverHangError) as e:
                 self.logger.warning(f"Tentativa {attempt + 1} falhou para {url}: {e}")
                 if attempt == max_retries - 1:
                     raise DiscogsScraperError(f"Falha ao acessar {url} após {max_retries} tentativas")
-                time.sleep(5 * (attempt + 1))
+                time.sleep(self._capped(5 * (attempt + 1)))
         
         return None
     
@@ -130,13 +186,13 @@ class DiscogsScraper:
             
             if artist_url not in artist_links:
                 artist_links.append(artist_url)
-                self.logger.debug(f"Artista encontrado: {artist_url}")
+                self.logger.debug("Artista encontrado: %s", artist_url, extra={'url': artist_url, 'stage': 'search'})
         
         self.logger.info(f"Encontrados {len(artist_links)} artistas")
         return artist_links
     
-    def scrape_artist_info(self, artist_url: str, genre: str) -> Optional[Artist]:
-        self.logger.info(f"Coletando dados do artista: {artist_url}")
+    def scrape_artist_info(self, artist_url: str, genre: str, include_albums: bool = True) -> Optional[Artist]:
+        self.logger.info("Coletando dados do artista: %s", artist_url, extra={'url': artist_url, 'stage': 'artist'})
         
         soup = self._make_request(artist_url)
         if not soup:
@@ -156,6 +212,8 @@ class DiscogsScraper:
                 artist_name = name_tag.get_text(strip=True)
             
             members = []
+            member_ids = []
+            group_ids = []
             script_tag = soup.find('script', id='dsdata')
             if script_tag:
                 try:
@@ -165,17 +223,17 @@ class DiscogsScraper:
                     for key in data.get('data', {}).keys():
                         if key.startswith('Artist:'):
                             artist_data = data['data'][key]
-                            members_list = artist_data.get('members', [])
                             
                             # members é uma lista de referências: {'__ref': 'Artist:{"discogsId":123}'}
-                            for member_ref in members_list:
-                                if isinstance(member_ref, dict) and 'artist' in member_ref:
-                                    artist_ref_key = member_ref['artist'].get('__ref')
-                                    if artist_ref_key and artist_ref_key in data['data']:
-                                        member_artist = data['data'][artist_ref_key]
-                                        member_name = member_artist.get('name')
-                                        if member_name and member_name != artist_name:
-                                            members.append(member_name)
+                            for member_name, member_id in self._extract_artist_refs(data['data'], artist_data.get('members', [])):
+                                if member_name and member_name != artist_name:
+                                    members.append(member_name)
+                                    # member_ids fica alinhado com members (None se o membro não tem id)
+                                    member_ids.append(f"discogs-artist-{member_id}" if member_id else None)
+                            
+                            for _, group_id in self._extract_artist_refs(data['data'], artist_data.get('groups', [])):
+                                if group_id:
+                                    group_ids.append(f"discogs-artist-{group_id}")
                             break
                 except Exception as e:
                     self.logger.warning(f"Erro ao extrair membros do JSON: {e}")
@@ -193,10 +251,13 @@ class DiscogsScraper:
                 genre=genre,
                 members=members,
                 websites=websites,
-                url=artist_url
+                url=artist_url,
+                member_ids=member_ids,
+                group_ids=group_ids
             )
             
-            self._scrape_artist_albums(artist, artist_url)
+            if include_albums:
+                self._scrape_artist_albums(artist, artist_url)
             
             return artist
             
@@ -204,12 +265,28 @@ class DiscogsScraper:
             self.logger.error(f"Erro ao processar artista {artist_url}: {e}")
             return None
     
-    def _scrape_artist_albums(self, artist: Artist, artist_url: str, max_albums: int = 10) -> None:
+    def _extract_artist_refs(self, entities: dict, refs: list) -> List[Tuple[Optional[str], Optional[str]]]:
+        result = []
+        for ref in refs or []:
+            if not isinstance(ref, dict) or not isinstance(ref.get('artist'), dict):
+                continue
+            ref_key = ref['artist'].get('__ref')
+            if not ref_key or ref_key not in entities:
+                continue
+            ref_artist = entities[ref_key]
+            ref_id = ref_artist.get('discogsId')
+            if ref_id is None:
+                match = re.search(r'"discogsId"\s*:\s*(\d+)', ref_key)
+                ref_id = match.group(1) if match else None
+            result.append((ref_artist.get('name'), str(ref_id) if ref_id is not None else None))
+        return result
+    
+    def list_artist_album_urls(self, artist_url: str, max_albums: int = MAX_ALBUMS_PER_ARTIST) -> List[str]:
         discography_url = f"{artist_url}?superFilter=Releases&subFilter=Albums"
         
         soup = self._make_request(discography_url)
         if not soup:
-            return
+            return []
         
         album_links = []
         
@@ -226,14 +303,21 @@ class DiscogsScraper:
                         if key.startswith('Release:'):
                             release_keys.append(key)
                     
-                    for key in release_keys[:max_albums]:
+                    # Agrupa prensagens do mesmo master antes de gastar carregamentos de página
+                    selected_keys = select_canonical_releases(
+                        data['data'], release_keys, max_albums, self.release_strategy
+                    )
+                    
+                    for key in selected_keys:
                         release_data = data['data'][key]
                         site_url = release_data.get('siteUrl')
                         if site_url:
                             album_url = urljoin(self.base_url, site_url)
                             album_links.append(album_url)
                     
-                    self.logger.info(f"Encontrados {len(album_links)} álbuns")
+                    self.logger.info("Encontrados %d álbuns distintos (%d releases na discografia)",
+                                     len(album_links), len(release_keys),
+                                     extra={'url': discography_url, 'stage': 'discography', 'sampled': True})
             
             except Exception as e:
                 self.logger.error(f"Erro ao extrair dados JSON: {e}")
@@ -256,12 +340,9 @@ class DiscogsScraper:
                     album_url = urljoin(self.base_url, link_tag['href'])
                     album_links.append(album_url)
         
-        for album_url in album_links:
-            album = self._scrape_album_details(album_url)
-            if album:
-                artist.add_album(album)
+        return album_links
     
-    def _scrape_album_details(self, album_url: str) -> Optional[Album]:
+    def scrape_album_details(self, album_url: str) -> Optional[Album]:
         soup = self._make_request(album_url)
         if not soup:
             return None
@@ -337,7 +418,8 @@ class DiscogsScraper:
                                     )
                                     tracks.append(track)
                         
-                        self.logger.info(f"Extraídos dados JSON: {album_name}, {len(tracks)} tracks")
+                        self.logger.info("Extraídos dados JSON: %s, %d tracks", album_name, len(tracks),
+                                         extra={'url': album_url, 'stage': 'album', 'sampled': True})
                 
                 except Exception as e:
                     self.logger.warning(f"Erro ao extrair JSON do álbum: {e}, tentando CSS...")
@@ -418,22 +500,3 @@ class DiscogsScraper:
                 continue
         
         return tracks
-    
-    def scrape_genre_data(self, genre: str, max_artists: int = 10) -> List[Artist]:
-        self.logger.info(f"Iniciando coleta de dados para o gênero: {genre}")
-        
-        artist_urls = self.search_artists_by_genre(genre, max_artists)
-        artists = []
-        for artist_url in artist_urls:
-            try:
-                artist = self.scrape_artist_info(artist_url, genre)
-                if artist:  
-                    artists.append(artist)
-                    self.logger.info(f"Coletado: {artist.name} com {len(artist.albums)} álbum(s)")
-                
-            except Exception as e:
-                self.logger.error(f"Erro ao coletar dados do artista {artist_url}: {e}")
-                continue
-        
-        self.logger.info(f"Coleta finalizada. Total de artistas: {len(artists)}")
-        return artists
\ No newline at end of file
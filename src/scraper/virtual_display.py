@@ -0,0 +1,118 @@
+import logging
+import os
+import select
+import shutil
+import subprocess
+import time
+from typing import Any, Dict, Optional
+
+from .driver_manager import process_tree_rss_mb
+
+
+class VirtualDisplayError(Exception):
+    pass
+
+
+class VirtualDisplay:
+    """
+    Display X virtual (Xvfb) dedicado a um navegador, para rodar o Chrome com
+    interface (necessário por causa do Cloudflare) em servidores sem desktop.
+    O número do display é escolhido pelo próprio Xvfb via -displayfd, então
+    vários workers no mesmo host não disputam o mesmo display.
+    """
+    def __init__(self, width: int = 1280, height: int = 720, depth: int = 16,
+                 xvfb_path: str = "Xvfb", start_timeout: float = 10):
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.xvfb_path = xvfb_path
+        self.start_timeout = start_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self.display_number: Optional[int] = None
+        self.process: Optional[subprocess.Popen] = None
+        self.started_at: Optional[float] = None
+
+    @property
+    def display(self) -> Optional[str]:
+        return f":{self.display_number}" if self.display_number is not None else None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def command(self, displayfd: int) -> list:
+        return [
+            self.xvfb_path,
+            '-displayfd', str(displayfd),
+            '-screen', '0', f'{self.width}x{self.height}x{self.depth}',
+            '-nolisten', 'tcp',
+            '-nocursor',
+        ]
+
+    def start(self) -> str:
+        if self.process is not None:
+            return self.display
+
+        if not shutil.which(self.xvfb_path):
+            raise VirtualDisplayError(f"Xvfb não encontrado ({self.xvfb_path})")
+
+        read_fd, write_fd = os.pipe()
+        try:
+            self.process = subprocess.Popen(
+                self.command(write_fd),
+                pass_fds=(write_fd,),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            os.close(write_fd)
+            write_fd = None
+
+            # O Xvfb escreve o número do display no fd quando está pronto para conexões
+            ready, _, _ = select.select([read_fd], [], [], self.start_timeout)
+            output = os.read(read_fd, 32).decode().strip() if ready else ''
+        finally:
+            if write_fd is not None:
+                os.close(write_fd)
+            os.close(read_fd)
+
+        if not output.isdigit():
+            self.stop()
+            raise VirtualDisplayError("Xvfb não informou o número do display a tempo")
+
+        self.display_number = int(output)
+        self.started_at = time.time()
+        self.logger.info(f"Display virtual {self.display} iniciado ({self.width}x{self.height}x{self.depth})")
+        return self.display
+
+    def resource_usage(self) -> Dict[str, Any]:
+        running = self.process is not None and self.process.poll() is None
+        return {
+            'display': self.display,
+            'pid': self.process.pid if self.process else None,
+            'running': running,
+            'rss_mb': round(process_tree_rss_mb(self.process.pid), 1) if running else 0.0,
+            'uptime_seconds': round(time.time() - self.started_at, 1) if self.started_at else 0.0,
+        }
+
+    def stop(self) -> None:
+        if self.process is None:
+            return
+
+        usage = self.resource_usage()
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+        if self.display_number is not None:
+            self.logger.info(f"Display virtual {self.display} encerrado: {usage}")
+        self.process = None
+        self.display_number = None
+        self.started_at = None
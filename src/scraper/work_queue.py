@@ -0,0 +1,239 @@
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+STATUS_PENDING = 'pending'
+STATUS_LEASED = 'leased'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+
+@dataclass
+class WorkItem:
+    item_id: int
+    kind: str
+    url: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+
+
+class WorkQueue(ABC):
+    """
+    Interface da fila de trabalho compartilhada entre coordinator e workers.
+    Itens são reivindicados com lease de tempo limitado; leases expirados voltam para a fila.
+    Coordinator e workers em hosts diferentes precisam de um backend de rede implementando esta interface.
+    """
+    @abstractmethod
+    def enqueue(self, kind: str, url: str, payload: Optional[Dict[str, Any]] = None) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float, kinds: Optional[List[str]] = None) -> Optional[WorkItem]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def renew(self, item_id: int, worker_id: str, lease_seconds: float) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, item_id: int, worker_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail(self, item_id: int, worker_id: str, error: str, max_attempts: int = 3) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def requeue_expired(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def heartbeat(self, worker_id: str, stats: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def workers(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def is_drained(self) -> bool:
+        stats = self.stats()
+        return stats.get(STATUS_PENDING, 0) == 0 and stats.get(STATUS_LEASED, 0) == 0
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_items (
+    item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires_at REAL,
+    last_error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_work_items_status ON work_items (status, lease_expires_at);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    last_seen REAL NOT NULL,
+    stats TEXT NOT NULL DEFAULT '{}'
+);
+"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """
+    Backend em SQLite para coordinator e workers no mesmo host (vários processos ou threads).
+    Não use em NFS/SMB: o modo WAL exige memória compartilhada local e o lock de arquivo em
+    rede não é confiável, o que quebraria a garantia de lease do BEGIN IMMEDIATE.
+    Para workers em outros hosts, o coordinator serve a fila com WorkQueueServer (queue_service).
+    Cada operação abre sua própria conexão, então a instância pode ser usada por várias threads.
+    """
+    def __init__(self, db_path: str, clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self.clock = clock
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        with self._connect() as conn:
+            # IMMEDIATE: reserva a escrita já no início, evitando dois workers com o mesmo item
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def enqueue(self, kind: str, url: str, payload: Optional[Dict[str, Any]] = None) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO work_items (kind, url, payload, updated_at) VALUES (?, ?, ?, ?)",
+                (kind, url, json.dumps(payload or {}, ensure_ascii=False), self.clock())
+            )
+            return cursor.rowcount > 0
+
+    def _requeue_expired(self, conn, now: float) -> int:
+        cursor = conn.execute(
+            "UPDATE work_items SET status = ?, worker_id = NULL, lease_expires_at = NULL, updated_at = ? "
+            "WHERE status = ? AND lease_expires_at < ?",
+            (STATUS_PENDING, now, STATUS_LEASED, now)
+        )
+        return cursor.rowcount
+
+    def requeue_expired(self) -> int:
+        with self._transaction() as conn:
+            return self._requeue_expired(conn, self.clock())
+
+    def claim(self, worker_id: str, lease_seconds: float, kinds: Optional[List[str]] = None) -> Optional[WorkItem]:
+        now = self.clock()
+        with self._transaction() as conn:
+            self._requeue_expired(conn, now)
+
+            query = "SELECT item_id, kind, url, payload, attempts FROM work_items WHERE status = ?"
+            params: List[Any] = [STATUS_PENDING]
+            if kinds:
+                query += f" AND kind IN ({','.join('?' * len(kinds))})"
+                params.extend(kinds)
+            query += " ORDER BY item_id LIMIT 1"
+
+            row = conn.execute(query, params).fetchone()
+            if not row:
+                return None
+
+            item_id, kind, url, payload, attempts = row
+            lease_expires_at = now + lease_seconds
+            conn.execute(
+                "UPDATE work_items SET status = ?, worker_id = ?, lease_expires_at = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE item_id = ?",
+                (STATUS_LEASED, worker_id, lease_expires_at, now, item_id)
+            )
+
+        return WorkItem(
+            item_id=item_id,
+            kind=kind,
+            url=url,
+            payload=json.loads(payload),
+            attempts=attempts + 1,
+            worker_id=worker_id,
+            lease_expires_at=lease_expires_at
+        )
+
+    def renew(self, item_id: int, worker_id: str, lease_seconds: float) -> bool:
+        now = self.clock()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE work_items SET lease_expires_at = ?, updated_at = ? "
+                "WHERE item_id = ? AND worker_id = ? AND status = ?",
+                (now + lease_seconds, now, item_id, worker_id, STATUS_LEASED)
+            )
+            return cursor.rowcount > 0
+
+    def complete(self, item_id: int, worker_id: str) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE work_items SET status = ?, lease_expires_at = NULL, updated_at = ? "
+                "WHERE item_id = ? AND worker_id = ? AND status = ?",
+                (STATUS_DONE, self.clock(), item_id, worker_id, STATUS_LEASED)
+            )
+            return cursor.rowcount > 0
+
+    def fail(self, item_id: int, worker_id: str, error: str, max_attempts: int = 3) -> None:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts FROM work_items WHERE item_id = ? AND worker_id = ?",
+                (item_id, worker_id)
+            ).fetchone()
+            if not row:
+                return
+            status = STATUS_FAILED if row[0] >= max_attempts else STATUS_PENDING
+            conn.execute(
+                "UPDATE work_items SET status = ?, worker_id = NULL, lease_expires_at = NULL, "
+                "last_error = ?, updated_at = ? WHERE item_id = ?",
+                (status, error, self.clock(), item_id)
+            )
+
+    def heartbeat(self, worker_id: str, stats: Dict[str, Any]) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO workers (worker_id, last_seen, stats) VALUES (?, ?, ?) "
+                "ON CONFLICT (worker_id) DO UPDATE SET last_seen = excluded.last_seen, stats = excluded.stats",
+                (worker_id, self.clock(), json.dumps(stats))
+            )
+
+    def workers(self) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT worker_id, last_seen, stats FROM workers ORDER BY worker_id").fetchall()
+        return [
+            {'worker_id': worker_id, 'last_seen': last_seen, **json.loads(stats)}
+            for worker_id, last_seen, stats in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM work_items GROUP BY status").fetchall()
+        counts = {STATUS_PENDING: 0, STATUS_LEASED: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        counts.update(dict(rows))
+        return counts
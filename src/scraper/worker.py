@@ -0,0 +1,131 @@
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .work_queue import WorkQueue, WorkItem
+from ..utils.serialization import dumps_line
+
+KIND_ARTIST = 'artist'
+
+
+class LeaseLostError(Exception):
+    """O lease do item expirou e foi assumido por outro worker"""
+    pass
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class CrawlWorker:
+    """
+    Consome itens da WorkQueue compartilhada com um DiscogsScraper local.
+    Cada artista coletado é anexado imediatamente ao JSONL do worker antes de
+    marcar o item como concluído, então um worker que morre perde apenas o item em andamento.
+    Se o lease foi perdido, o item fica com o worker que o assumiu e não é contado aqui.
+    """
+    def __init__(self, queue: WorkQueue, scraper, output_path: str, worker_id: Optional[str] = None,
+                 lease_seconds: float = 600, heartbeat_interval: float = 30, max_attempts: int = 3):
+        self.queue = queue
+        self.scraper = scraper
+        self.output_path = output_path
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = heartbeat_interval
+        self.max_attempts = max_attempts
+        self.logger = logging.getLogger(__name__)
+
+        self.artists = []
+        self.processed = 0
+        self.failed = 0
+        self.lost_leases = 0
+        self.started_at = time.time()
+        self._current: Optional[WorkItem] = None
+        self._stop = threading.Event()
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        return {
+            'processed': self.processed,
+            'failed': self.failed,
+            'lost_leases': self.lost_leases,
+            'items_per_minute': round(self.processed * 60 / elapsed, 2),
+            'current_url': self._current.url if self._current else None
+        }
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop.wait(self.heartbeat_interval):
+            try:
+                current = self._current
+                if current:
+                    # Renova o lease do item em andamento enquanto o worker estiver vivo
+                    self.queue.renew(current.item_id, self.worker_id, self.lease_seconds)
+                self.queue.heartbeat(self.worker_id, self.stats())
+            except Exception as e:
+                self.logger.warning(f"Falha no heartbeat do worker {self.worker_id}: {e}")
+
+    def _process(self, item: WorkItem, output):
+        if item.kind != KIND_ARTIST:
+            raise ValueError(f"Tipo de item não suportado: {item.kind}")
+
+        artist = self.scraper.scrape_artist_info(item.url, item.payload.get('genre', ''))
+        if not artist:
+            raise RuntimeError(f"Nenhum dado coletado para {item.url}")
+
+        # Confirma que o lease ainda é deste worker antes de gravar (a coleta pode ter passado do lease)
+        if not self.queue.renew(item.item_id, self.worker_id, self.lease_seconds):
+            raise LeaseLostError(f"Lease de {item.url} perdido antes da gravação")
+
+        output.write(dumps_line(artist.to_dict()))
+        output.flush()
+        return artist
+
+    def run(self, max_items: Optional[int] = None, idle_timeout: float = 60, poll_interval: float = 5) -> int:
+        """Processa itens até a fila esvaziar (ou max_items); retorna o número de itens concluídos"""
+        self.queue.heartbeat(self.worker_id, self.stats())
+        heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        heartbeat.start()
+
+        idle_since = None
+        try:
+            with open(self.output_path, 'ab') as output:
+                while max_items is None or self.processed < max_items:
+                    item = self.queue.claim(self.worker_id, self.lease_seconds, kinds=[KIND_ARTIST])
+                    if item is None:
+                        if self.queue.is_drained():
+                            break
+                        # Outros workers ainda têm leases ativos: aguarda re-enfileiramento ou conclusão
+                        idle_since = idle_since or time.time()
+                        if time.time() - idle_since > idle_timeout:
+                            break
+                        time.sleep(poll_interval)
+                        continue
+
+                    idle_since = None
+                    self._current = item
+                    try:
+                        artist = self._process(item, output)
+                        if not self.queue.complete(item.item_id, self.worker_id):
+                            # A linha já gravada vira duplicata do outro worker; o merge consolida pelo id
+                            raise LeaseLostError(f"Lease de {item.url} perdido antes da conclusão")
+                        self.artists.append(artist)
+                        self.processed += 1
+                        self.logger.info(f"Worker {self.worker_id} concluiu {item.url} ({self.processed} itens)")
+                    except LeaseLostError as e:
+                        self.lost_leases += 1
+                        self.logger.warning(f"Worker {self.worker_id}: {e}")
+                    except Exception as e:
+                        self.failed += 1
+                        self.logger.error(f"Worker {self.worker_id} falhou em {item.url}: {e}")
+                        self.queue.fail(item.item_id, self.worker_id, str(e), self.max_attempts)
+                    finally:
+                        self._current = None
+        finally:
+            self._stop.set()
+            heartbeat.join(timeout=1)
+            self.queue.heartbeat(self.worker_id, self.stats())
+
+        return self.processed
@@ -1,8 +1,10 @@
-import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional
 import os
 from datetime import datetime
 from ..scraper.data_models import Artist
+from .shard_writer import ShardedJsonlWriter
+from .serialization import write_jsonl
+from .sqlite_sink import SQLiteSink
 
 class DataProcessor:   
     def __init__(self, output_dir: str = "data/output"):
@@ -21,40 +23,39 @@ class DataProcessor:
         
         output_path = os.path.join(self.output_dir, filename)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for artist in artists:
-                record = {
-                    'id': artist.artist_id,
-                    'name': artist.name,
-                    'genre': artist.genre,
-                    'members': artist.members if artist.members else [],
-                    'websites': [
-                        w for w in artist.websites 
-                        if w and 'discogs' not in w.lower()
-                    ],
-                    'albums': [
-                        {
-                            'id': album.album_id,
-                            'name': album.name,
-                            'year': album.year,
-                            'label': album.label,
-                            'styles': album.styles if album.styles else [],
-                            'tracks': [
-                                {
-                                    'number': track.number,
-                                    'title': track.title,
-                                    'duration': track.duration
-                                }
-                                for track in album.tracks
-                            ]
-                        }
-                        for album in artist.albums
-                    ]
-                }
-                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        with open(output_path, 'wb') as f:
+            write_jsonl(f, (artist.to_dict() for artist in artists))
         
         return output_path
     
+    def artists_to_jsonl_shards(self, artists: Iterable[Artist], basename: str = None,
+                                compression: str = 'gzip', max_records: Optional[int] = None,
+                                max_bytes: Optional[int] = None) -> str:
+        """
+        Exporta artistas para shards JSONL comprimidos, rotacionados por registros/bytes
+        Retorna o caminho do manifest com a lista de shards, contagens e checksums
+        """
+        if not basename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            basename = f"discogs_data_{timestamp}"
+        
+        with ShardedJsonlWriter(self.output_dir, basename, compression,
+                                max_records=max_records, max_bytes=max_bytes) as writer:
+            for artist in artists:
+                writer.write(artist.to_dict())
+        
+        return writer.manifest_path
+    
+    def artists_to_sqlite(self, artists: Iterable[Artist], db_path: str, batch_size: int = 500) -> str:
+        """
+        Grava artistas em SQLite normalizado com upserts
+        Coletas repetidas atualizam as linhas existentes em vez de duplicar
+        """
+        with SQLiteSink(db_path, batch_size) as sink:
+            sink.write_artists(artists)
+        
+        return db_path
+    
     def generate_summary_report(self, artists: List[Artist]) -> Dict[str, Any]:
         total_artists = len(artists)
         total_albums = sum(len(artist.albums) for artist in artists)
@@ -0,0 +1,140 @@
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+INDEX_MAGIC = b'DJIX'
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.idx'
+
+# Cabeçalho: magic, versão, tamanho e mtime (ns) do JSONL, número de entradas
+_HEADER = struct.Struct('<4sBQQI')
+# Entrada: tipo (0 artista, 1 álbum), offset, tamanho da linha, tamanho do id
+_ENTRY = struct.Struct('<BQIH')
+
+KIND_ARTIST = 0
+KIND_ALBUM = 1
+
+
+class JsonlIndexError(Exception):
+    pass
+
+
+def default_index_path(jsonl_path: str) -> str:
+    return jsonl_path + INDEX_SUFFIX
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def build_index(jsonl_path: str, index_path: Optional[str] = None) -> str:
+    """
+    Gera um índice binário compacto (sidecar) com o offset em bytes de cada
+    artista e de cada álbum no JSONL. Álbuns apontam para a linha do artista.
+    """
+    index_path = index_path or default_index_path(jsonl_path)
+    entries = []
+
+    with open(jsonl_path, 'rb') as f:
+        offset = 0
+        for line in f:
+            length = len(line)
+            if line.strip():
+                record = json.loads(line)
+                entries.append((KIND_ARTIST, offset, length, record['id']))
+                for album in record.get('albums', []):
+                    if album.get('id'):
+                        entries.append((KIND_ALBUM, offset, length, album['id']))
+            offset += length
+
+    size, mtime_ns = _file_signature(jsonl_path)
+    with open(index_path, 'wb') as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, size, mtime_ns, len(entries)))
+        for kind, offset, length, entity_id in entries:
+            encoded_id = entity_id.encode('utf-8')
+            f.write(_ENTRY.pack(kind, offset, length, len(encoded_id)))
+            f.write(encoded_id)
+
+    return index_path
+
+
+def _load_index(index_path: str) -> Tuple[Tuple[int, int], Dict[int, Dict[str, Tuple[int, int]]]]:
+    with open(index_path, 'rb') as f:
+        data = f.read()
+
+    magic, version, size, mtime_ns, count = _HEADER.unpack_from(data, 0)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+        raise JsonlIndexError(f"Arquivo de índice inválido: {index_path}")
+
+    lookup: Dict[int, Dict[str, Tuple[int, int]]] = {KIND_ARTIST: {}, KIND_ALBUM: {}}
+    position = _HEADER.size
+    for _ in range(count):
+        kind, offset, length, id_length = _ENTRY.unpack_from(data, position)
+        position += _ENTRY.size
+        entity_id = data[position:position + id_length].decode('utf-8')
+        position += id_length
+        # Primeira ocorrência vence, igual a uma varredura sequencial
+        lookup[kind].setdefault(entity_id, (offset, length))
+
+    return (size, mtime_ns), lookup
+
+
+class JsonlIndexReader:
+    """
+    Leitura por id de artistas/álbuns em um JSONL via mmap, sem carregar o arquivo.
+    O índice é gerado sob demanda se não existir ou estiver desatualizado.
+    """
+    def __init__(self, jsonl_path: str, index_path: Optional[str] = None, rebuild_if_stale: bool = True):
+        self.jsonl_path = jsonl_path
+        self.index_path = index_path or default_index_path(jsonl_path)
+
+        if not os.path.exists(self.index_path):
+            build_index(jsonl_path, self.index_path)
+
+        signature, self._lookup = _load_index(self.index_path)
+        if signature != _file_signature(jsonl_path):
+            if not rebuild_if_stale:
+                raise JsonlIndexError(f"Índice desatualizado para {jsonl_path}")
+            build_index(jsonl_path, self.index_path)
+            _, self._lookup = _load_index(self.index_path)
+
+        self._file = open(jsonl_path, 'rb')
+        self._mmap = None
+        if os.path.getsize(jsonl_path) > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._lookup[KIND_ARTIST] or entity_id in self._lookup[KIND_ALBUM]
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def _read_line(self, position: Tuple[int, int]) -> Dict:
+        offset, length = position
+        return json.loads(self._mmap[offset:offset + length])
+
+    def get_artist(self, artist_id: str) -> Optional[Dict]:
+        position = self._lookup[KIND_ARTIST].get(artist_id)
+        return self._read_line(position) if position else None
+
+    def get_album(self, album_id: str) -> Optional[Dict]:
+        position = self._lookup[KIND_ALBUM].get(album_id)
+        if not position:
+            return None
+        artist = self._read_line(position)
+        for album in artist.get('albums', []):
+            if album.get('id') == album_id:
+                return dict(album, artist_id=artist['id'])
+        return None
@@ -0,0 +1,115 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Tuple
+
+# Campos estruturados aceitos via extra={...} nas chamadas de log
+STRUCTURED_FIELDS = ('url', 'stage', 'elapsed_ms', 'artist', 'album', 'worker_id')
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        for field_name in STRUCTURED_FIELDS:
+            value = getattr(record, field_name, None)
+            if value is not None:
+                entry[field_name] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Amostra mensagens marcadas com extra={'sampled': True} (ex.: uma por página).
+    Por template de mensagem, as primeiras `burst` de cada janela passam; acima
+    disso passa 1 a cada `rate`. Avisos e erros nunca são amostrados.
+    """
+    def __init__(self, burst: int = 20, rate: int = 10, window: float = 60.0):
+        super().__init__()
+        self.burst = burst
+        self.rate = rate
+        self.window = window
+        self._counters: Dict[Tuple[str, str], Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, 'sampled', False) or record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window_start, count = self._counters.get(key, (now, 0))
+            if now - window_start > self.window:
+                window_start, count = now, 0
+            count += 1
+            self._counters[key] = (window_start, count)
+
+        if count <= self.burst:
+            return True
+        return (count - self.burst) % self.rate == 0
+
+
+class _NonFormattingQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A fila é em processo: a formatação (e o f-string/%-format da mensagem)
+        # fica para a thread do listener, fora da thread de coleta
+        return record
+
+
+def setup_logging(log_level: str = "INFO", log_file: str = 'discogs_scraper.log',
+                  max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                  sample_burst: int = 20, sample_rate: int = 10) -> QueueListener:
+    """
+    Logging assíncrono: a thread de coleta só enfileira registros; uma thread em
+    background escreve no stdout (texto) e em arquivo rotativo (JSON estruturado).
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _NonFormattingQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(burst=sample_burst, rate=sample_rate))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(getattr(logging, log_level.upper()))
+
+    _listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Esvazia a fila e encerra a thread de escrita"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
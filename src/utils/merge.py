@@ -0,0 +1,326 @@
+import heapq
+import json
+import logging
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .serialization import dumps_line, write_jsonl
+from .shard_writer import ShardedJsonlWriter, iter_shard_records, shard_paths
+
+# Política de conflito por campo quando o mesmo id aparece em mais de uma saída:
+# "first"/"last" ficam com o valor da primeira/última entrada (na ordem dos arquivos),
+# "non_empty" com o primeiro valor não vazio e "union" concatena listas sem repetir
+CONFLICT_POLICIES = ('first', 'last', 'non_empty', 'union')
+
+# member_ids acompanha members (listas alinhadas): a política de "members" vale para os pares
+DEFAULT_FIELD_POLICIES = {
+    'members': 'union',
+    'group_ids': 'union',
+    'websites': 'union',
+    'styles': 'union',
+}
+
+MERGE_RUN_SIZE = 10000
+# Máximo de runs abertos ao mesmo tempo no merge k-way; acima disso o merge é feito em várias passadas
+MERGE_FAN_IN = 64
+
+logger = logging.getLogger(__name__)
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == '' or value == [] or value == {}
+
+
+def _record_id(record: Dict) -> str:
+    return str(record.get('id') or '')
+
+
+def expand_inputs(paths: List[str]) -> List[str]:
+    """Troca manifests de shards pelos seus shards, mantendo a ordem das entradas"""
+    files = []
+    for path in paths:
+        if path.endswith('_manifest.json'):
+            files.extend(shard_paths(path))
+        else:
+            files.append(path)
+    return files
+
+
+def report_path_for(path: str) -> str:
+    for suffix in ('_manifest.json', '.jsonl.gz', '.jsonl.zst', '.jsonl'):
+        if path.endswith(suffix):
+            return path[:-len(suffix)] + '_report.json'
+    return path + '_report.json'
+
+
+class RecordMerger:
+    """Combina registros com o mesmo id campo a campo; álbuns são deduplicados por id"""
+    def __init__(self, policy: str = 'non_empty', field_policies: Optional[Dict[str, str]] = None):
+        policies = dict(DEFAULT_FIELD_POLICIES)
+        policies.update(field_policies or {})
+        for name in [policy] + list(policies.values()):
+            if name not in CONFLICT_POLICIES:
+                raise ValueError(f"Política de conflito inválida: {name}")
+        self.policy = policy
+        self.field_policies = policies
+
+    def _merge_value(self, field_name: str, values: List[Any]) -> Any:
+        policy = self.field_policies.get(field_name, self.policy)
+        if policy == 'first':
+            return values[0]
+        if policy == 'last':
+            return values[-1]
+        if policy == 'union' and all(isinstance(value, list) for value in values if value is not None):
+            merged = []
+            for value in values:
+                for item in value or []:
+                    if item not in merged:
+                        merged.append(item)
+            return merged
+        for value in values:
+            if not _is_empty(value):
+                return value
+        return values[0]
+
+    def _merge_albums(self, album_lists: List[List[Dict]]) -> List[Dict]:
+        # Mantém a ordem da primeira aparição de cada álbum
+        versions: Dict[str, List[Dict]] = {}
+        for albums in album_lists:
+            for album in albums or []:
+                versions.setdefault(_record_id(album), []).append(album)
+        return [self.merge(album_versions) for album_versions in versions.values()]
+
+    def _merge_members(self, records: List[Dict]) -> Tuple[List[str], List[Optional[str]]]:
+        pair_lists = []
+        for record in records:
+            member_ids = record.get('member_ids') or []
+            pair_lists.append([
+                (name, member_ids[position] if position < len(member_ids) else None)
+                for position, name in enumerate(record.get('members') or [])
+            ])
+
+        if self.field_policies.get('members', self.policy) == 'union':
+            # Um membro por nome, mantendo o primeiro id conhecido
+            by_name: Dict[str, Optional[str]] = {}
+            for pairs in pair_lists:
+                for name, member_id in pairs:
+                    if by_name.get(name) is None:
+                        by_name[name] = member_id
+            pairs = list(by_name.items())
+        else:
+            pairs = self._merge_value('members', pair_lists)
+        return [name for name, _ in pairs], [member_id for _, member_id in pairs]
+
+    def merge(self, records: List[Dict]) -> Dict:
+        if len(records) == 1:
+            return records[0]
+
+        merged = {}
+        for record in records:
+            for field_name in record:
+                if field_name in merged:
+                    continue
+                if field_name == 'albums':
+                    merged['albums'] = self._merge_albums([r.get('albums') for r in records])
+                elif field_name in ('members', 'member_ids'):
+                    merged['members'], merged['member_ids'] = self._merge_members(records)
+                else:
+                    merged[field_name] = self._merge_value(
+                        field_name, [r[field_name] for r in records if field_name in r]
+                    )
+        return merged
+
+
+def _write_sorted_runs(path: str, run_dir: str, run_size: int) -> List[str]:
+    """Fase map: lê uma entrada e grava runs ordenados por id com até run_size registros"""
+    runs = []
+    prefix = os.path.basename(path).split('.')[0]
+
+    def flush(batch: List[Dict]) -> None:
+        batch.sort(key=_record_id)
+        fd, run_path = tempfile.mkstemp(prefix=f"{prefix}-", suffix='.jsonl', dir=run_dir)
+        with os.fdopen(fd, 'wb') as f:
+            write_jsonl(f, batch)
+        runs.append(run_path)
+
+    batch = []
+    for record in iter_shard_records(path):
+        batch.append(record)
+        if len(batch) >= run_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    return runs
+
+
+def _iter_run(path: str) -> Iterator[Dict]:
+    with open(path, 'rb') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _merge_runs(runs: List[str], run_dir: str) -> str:
+    fd, merged_path = tempfile.mkstemp(prefix='pass-', suffix='.jsonl', dir=run_dir)
+    with os.fdopen(fd, 'wb') as f:
+        write_jsonl(f, heapq.merge(*(_iter_run(run) for run in runs), key=_record_id))
+    for run in runs:
+        os.remove(run)
+    return merged_path
+
+
+def _reduce_runs(runs: List[str], run_dir: str, fan_in: int) -> List[str]:
+    """Combina runs em grupos de fan_in até sobrarem no máximo fan_in (limita arquivos abertos)"""
+    fan_in = max(fan_in, 2)
+    while len(runs) > fan_in:
+        # Grupos de runs consecutivos preservam a ordem das entradas para ids repetidos
+        runs = [_merge_runs(runs[start:start + fan_in], run_dir) for start in range(0, len(runs), fan_in)]
+    return runs
+
+
+class MergeStats:
+    """Totais do merge; os detalhes por artista vão para details_file (uma linha JSON cada), não para a memória"""
+    def __init__(self, details_file: Optional[BinaryIO] = None):
+        self.input_records = 0
+        self.output_records = 0
+        self.duplicates = 0
+        self.total_albums = 0
+        self.total_tracks = 0
+        self.details_file = details_file
+
+    def add(self, record: Dict, versions: int) -> None:
+        albums = record.get('albums') or []
+        tracks = sum(len(album.get('tracks') or []) for album in albums)
+        self.input_records += versions
+        self.output_records += 1
+        self.duplicates += versions - 1
+        self.total_albums += len(albums)
+        self.total_tracks += tracks
+        if self.details_file is not None:
+            self.details_file.write(dumps_line({
+                'name': record.get('name'),
+                'albums_count': len(albums),
+                'tracks_count': tracks,
+                'members_count': len(record.get('members') or [])
+            }))
+
+
+def _emit(merger: RecordMerger, group: List[Dict], stats: Optional[MergeStats]) -> Dict:
+    merged = merger.merge(group)
+    if stats is not None:
+        stats.add(merged, len(group))
+    return merged
+
+
+def merge_records(paths: List[str], merger: Optional[RecordMerger] = None, max_workers: int = 4,
+                  run_size: int = MERGE_RUN_SIZE, tmp_dir: Optional[str] = None,
+                  stats: Optional[MergeStats] = None, fan_in: int = MERGE_FAN_IN) -> Iterator[Dict]:
+    """
+    Merge externo de várias saídas JSONL (simples, .gz/.zst ou manifests de shards).
+    Cada entrada é ordenada por id em runs de tamanho limitado, em paralelo; os runs
+    são combinados com um merge k-way e cada id é emitido uma única vez, já combinado.
+    A memória fica limitada a run_size registros por leitor, não ao tamanho das entradas,
+    e no máximo fan_in runs ficam abertos por vez (passadas intermediárias se houver mais).
+    """
+    merger = merger or RecordMerger()
+    files = expand_inputs(paths)
+
+    with tempfile.TemporaryDirectory(prefix='discogs-merge-', dir=tmp_dir) as run_dir:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            run_lists = list(executor.map(lambda path: _write_sorted_runs(path, run_dir, run_size), files))
+
+        run_paths = _reduce_runs([run for run_list in run_lists for run in run_list], run_dir, fan_in)
+        # heapq.merge é estável: registros com o mesmo id saem na ordem das entradas
+        runs = [_iter_run(run) for run in run_paths]
+        group: List[Dict] = []
+        for record in heapq.merge(*runs, key=_record_id):
+            # Registros sem id não têm como ser deduplicados: cada um sai como está
+            if group and (not _record_id(record) or _record_id(record) != _record_id(group[0])):
+                yield _emit(merger, group, stats)
+                group = []
+            group.append(record)
+        if group:
+            yield _emit(merger, group, stats)
+
+
+def merge_reports(report_paths: List[str], stats: MergeStats) -> Dict[str, Any]:
+    """
+    Resumo no formato de generate_summary_report, recalculado sobre os dados combinados.
+    artist_details não entra aqui: é copiado do details_file por write_merged_report.
+    """
+    sources = []
+    for path in report_paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            summary = json.load(f).get('summary', {})
+        sources.append({'file': os.path.basename(path), **summary})
+
+    collection_dates = [source['collection_date'] for source in sources if source.get('collection_date')]
+    return {
+        'summary': {
+            'total_artists': stats.output_records,
+            'total_albums': stats.total_albums,
+            'total_tracks': stats.total_tracks,
+            'collection_date': max(collection_dates) if collection_dates else datetime.now().isoformat(),
+            'merged_at': datetime.now().isoformat(),
+            'input_records': stats.input_records,
+            'duplicates_merged': stats.duplicates
+        },
+        'sources': sources
+    }
+
+
+def write_merged_report(report: Dict[str, Any], details_file: BinaryIO, report_path: str) -> None:
+    """Grava o relatório copiando artist_details do arquivo temporário em streaming"""
+    body = json.dumps(report, ensure_ascii=False, indent=2)
+    details_file.seek(0)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        # body termina em "\n}": reabrimos o objeto para acrescentar a lista de detalhes
+        f.write(body[:-2])
+        f.write(',\n  "artist_details": [')
+        separator = '\n    '
+        for line in details_file:
+            f.write(separator)
+            f.write(line.decode('utf-8').rstrip('\n'))
+            separator = ',\n    '
+        f.write('\n  ]\n}')
+
+
+def merge_outputs(paths: List[str], output_path: str, policy: str = 'non_empty',
+                  field_policies: Optional[Dict[str, str]] = None, max_workers: int = 4,
+                  run_size: int = MERGE_RUN_SIZE, compression: str = 'gzip',
+                  max_records: Optional[int] = None, max_bytes: Optional[int] = None,
+                  fan_in: int = MERGE_FAN_IN) -> Dict[str, Any]:
+    """
+    Consolida saídas de várias coletas em um JSONL (ou shards, com max_records/max_bytes)
+    ordenado por id e grava o relatório combinado ao lado.
+    Retorna summary e sources do relatório (artist_details fica apenas no arquivo).
+    """
+    merger = RecordMerger(policy, field_policies)
+    details_file = tempfile.TemporaryFile()
+    stats = MergeStats(details_file)
+    records = merge_records(paths, merger, max_workers, run_size, stats=stats, fan_in=fan_in)
+    output_dir = os.path.dirname(output_path) or '.'
+
+    with details_file:
+        if max_records or max_bytes:
+            basename = os.path.basename(output_path).replace('.jsonl', '')
+            with ShardedJsonlWriter(output_dir, basename, compression,
+                                    max_records=max_records, max_bytes=max_bytes) as writer:
+                for record in records:
+                    writer.write(record)
+            output_path = writer.manifest_path
+        else:
+            with open(output_path, 'wb') as f:
+                write_jsonl(f, records)
+
+        report = merge_reports([report_path_for(path) for path in paths], stats)
+        write_merged_report(report, details_file, report_path_for(output_path))
+
+    logger.info(f"Merge de {len(paths)} entrada(s): {stats.input_records} registros, "
+                f"{stats.output_records} artistas, {stats.duplicates} duplicata(s) combinada(s)")
+    return report
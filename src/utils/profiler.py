@@ -0,0 +1,115 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+
+class CrawlProfiler:
+    """
+    Profiler de baixo overhead para a coleta: uma thread amostra as pilhas de
+    todas as threads a cada `interval` segundos (formato "folded", compatível com
+    flamegraph.pl/speedscope) e o tracemalloc registra a memória em cada etapa.
+    """
+    def __init__(self, interval: float = 0.01, top_allocations: int = 20, tracemalloc_frames: int = 1):
+        self.interval = interval
+        self.top_allocations = top_allocations
+        self.tracemalloc_frames = tracemalloc_frames
+
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.stages: List[Dict] = []
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._started_at = 0.0
+        self._stage_started_at = 0.0
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.tracemalloc_frames)
+        self._started_at = self._stage_started_at = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="crawl-profiler", daemon=True)
+        self._thread.start()
+
+    def _frame_label(self, frame) -> str:
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+    def _sample_loop(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def snapshot(self, label: str) -> None:
+        """Marca o fim de uma etapa (ex.: busca, cada artista, exportação)"""
+        if not tracemalloc.is_tracing():
+            return
+        now = time.perf_counter()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+
+        top = snapshot.statistics('lineno')[:self.top_allocations]
+        growth = []
+        if self._last_snapshot is not None:
+            growth = [
+                stat for stat in snapshot.compare_to(self._last_snapshot, 'lineno')
+                if stat.size_diff > 0
+            ][:self.top_allocations]
+
+        # Guarda só os textos: manter todos os snapshots custaria mais memória que a coleta
+        self.stages.append({
+            'label': label,
+            'seconds': now - self._stage_started_at,
+            'current_bytes': current,
+            'peak_bytes': peak,
+            'top': [str(stat) for stat in top],
+            'growth': [str(stat) for stat in growth],
+        })
+        self._last_snapshot = snapshot
+        self._stage_started_at = now
+
+    def stop(self, output_prefix: str) -> Tuple[str, str]:
+        """Encerra a amostragem e grava <prefixo>_profile.folded e <prefixo>_allocations.txt"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+        folded_path = f"{output_prefix}_profile.folded"
+        with open(folded_path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        report_path = f"{output_prefix}_allocations.txt"
+        with open(report_path, 'w', encoding='utf-8') as f:
+            total = time.perf_counter() - self._started_at
+            f.write(f"Duração total: {total:.2f}s, {self.samples} amostras a cada {self.interval}s\n")
+            for stage in self.stages:
+                f.write(f"\n== {stage['label']} ({stage['seconds']:.2f}s, "
+                        f"atual {stage['current_bytes'] / 1024 / 1024:.1f}MB, "
+                        f"pico {stage['peak_bytes'] / 1024 / 1024:.1f}MB)\n")
+                f.write("-- Maiores alocações\n")
+                for line in stage['top']:
+                    f.write(f"{line}\n")
+                if stage['growth']:
+                    f.write("-- Crescimento desde a etapa anterior\n")
+                    for line in stage['growth']:
+                        f.write(f"{line}\n")
+
+        tracemalloc.stop()
+        self._last_snapshot = None
+        return folded_path, report_path
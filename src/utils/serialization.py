@@ -0,0 +1,37 @@
+import json
+from typing import Any, Iterable, BinaryIO
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional, fallback para json da stdlib
+    orjson = None
+
+WRITE_BATCH_SIZE = 500
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps_line(record: Any) -> bytes:
+    """
+    Serializa um registro como uma linha JSONL em UTF-8.
+    Ambos os backends geram a mesma saída compacta, sem escapar caracteres não-ASCII.
+    """
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def write_jsonl(f: BinaryIO, records: Iterable[Any], batch_size: int = WRITE_BATCH_SIZE) -> int:
+    """Escreve registros em lotes com writelines, retorna o total de linhas escritas"""
+    count = 0
+    batch = []
+    for record in records:
+        batch.append(dumps_line(record))
+        if len(batch) >= batch_size:
+            f.writelines(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        f.writelines(batch)
+        count += len(batch)
+    return count
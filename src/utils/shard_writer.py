@@ -0,0 +1,213 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .serialization import dumps_line
+
+try:
+    import zstandard
+except ImportError:  # zstd é opcional, gzip sempre disponível
+    zstandard = None
+
+COMPRESSION_EXTENSIONS = {
+    'none': '',
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+
+def _open_compressed_writer(path: str, compression: str):
+    if compression == 'gzip':
+        return gzip.open(path, 'wb')
+    if compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("Compressão zstd requer o pacote 'zstandard'")
+        raw = open(path, 'wb')
+        return zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+    return open(path, 'wb')
+
+
+def open_shard(path: str):
+    """Abre um shard (ou JSONL simples) para leitura de texto conforme a extensão"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError("Leitura de shards zstd requer o pacote 'zstandard'")
+        raw = open(path, 'rb')
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(reader, encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ShardedJsonlWriter:
+    """
+    Escreve registros JSONL em shards comprimidos, rotacionados por número de
+    registros e/ou bytes (não comprimidos). Ao fechar, grava um manifest com
+    contagem de registros e checksum sha256 de cada shard.
+    """
+    def __init__(self, output_dir: str, basename: str, compression: str = 'gzip',
+                 max_records: Optional[int] = None, max_bytes: Optional[int] = None):
+        if compression not in COMPRESSION_EXTENSIONS:
+            raise ValueError(f"Compressão inválida: {compression}")
+        if compression == 'zstd' and zstandard is None:
+            raise RuntimeError("Compressão zstd requer o pacote 'zstandard'")
+
+        self.output_dir = output_dir
+        self.basename = basename
+        self.compression = compression
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.shards: List[Dict[str, Any]] = []
+        self.manifest_path = os.path.join(output_dir, f"{basename}_manifest.json")
+
+        self._file = None
+        self._path = None
+        self._records = 0
+        self._bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _should_rotate(self) -> bool:
+        if self._file is None:
+            return True
+        if self.max_records and self._records >= self.max_records:
+            return True
+        if self.max_bytes and self._bytes >= self.max_bytes:
+            return True
+        return False
+
+    def _open_next_shard(self) -> None:
+        self._close_current_shard()
+        extension = COMPRESSION_EXTENSIONS[self.compression]
+        filename = f"{self.basename}-{len(self.shards):05d}.jsonl{extension}"
+        self._path = os.path.join(self.output_dir, filename)
+        self._file = _open_compressed_writer(self._path, self.compression)
+        self._records = 0
+        self._bytes = 0
+
+    def _close_current_shard(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self.shards.append({
+            'file': os.path.basename(self._path),
+            'records': self._records,
+            'uncompressed_bytes': self._bytes,
+            'bytes': os.path.getsize(self._path),
+            'sha256': _file_sha256(self._path)
+        })
+        self._file = None
+
+    def write_line(self, line: bytes) -> None:
+        if self._should_rotate():
+            self._open_next_shard()
+        self._file.write(line)
+        self._records += 1
+        self._bytes += len(line)
+
+    def write(self, record: Dict) -> None:
+        self.write_line(dumps_line(record))
+
+    def close(self) -> str:
+        self._close_current_shard()
+        manifest = {
+            'created_at': datetime.now().isoformat(),
+            'compression': self.compression,
+            'total_records': sum(shard['records'] for shard in self.shards),
+            'shards': self.shards
+        }
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return self.manifest_path
+
+
+def read_manifest(manifest_path: str) -> Dict[str, Any]:
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def shard_paths(manifest_path: str) -> List[str]:
+    base_dir = os.path.dirname(manifest_path)
+    return [os.path.join(base_dir, shard['file']) for shard in read_manifest(manifest_path)['shards']]
+
+
+def verify_shards(manifest_path: str) -> bool:
+    base_dir = os.path.dirname(manifest_path)
+    for shard in read_manifest(manifest_path)['shards']:
+        if _file_sha256(os.path.join(base_dir, shard['file'])) != shard['sha256']:
+            return False
+    return True
+
+
+def iter_shard_records(path: str) -> Iterator[Dict]:
+    with open_shard(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def map_shards(manifest_path: str, func: Callable[[str], Any], max_workers: int = 4) -> List[Any]:
+    """Aplica func(caminho_do_shard) em paralelo, um shard por tarefa, preservando a ordem"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, shard_paths(manifest_path)))
+
+
+def iter_records_parallel(manifest_path: str, max_workers: int = 4, buffer_size: int = 1000) -> Iterator[Dict]:
+    """
+    Lê todos os shards em paralelo e entrega os registros em streaming.
+    A fila limitada mantém a memória constante; a ordem entre shards não é garantida.
+    """
+    paths = shard_paths(manifest_path)
+    records: queue.Queue = queue.Queue(maxsize=buffer_size)
+    done = object()
+    stop = threading.Event()
+
+    def read(path: str) -> None:
+        try:
+            for record in iter_shard_records(path):
+                if stop.is_set():
+                    return
+                records.put(record)
+        finally:
+            records.put(done)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(read, path) for path in paths]
+        finished = 0
+        try:
+            while finished < len(paths):
+                item = records.get()
+                if item is done:
+                    finished += 1
+                    continue
+                yield item
+        finally:
+            stop.set()
+            # Drena a fila para liberar leitores bloqueados em put()
+            while not all(future.done() for future in futures):
+                try:
+                    records.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+        for future in futures:
+            future.result()
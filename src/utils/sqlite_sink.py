@@ -0,0 +1,159 @@
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from ..scraper.data_models import Artist
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artists (
+    artist_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    genre TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artist_members (
+    artist_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    member_name TEXT NOT NULL,
+    member_id TEXT,
+    PRIMARY KEY (artist_id, position)
+);
+CREATE TABLE IF NOT EXISTS artist_websites (
+    artist_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (artist_id, url)
+);
+CREATE TABLE IF NOT EXISTS albums (
+    album_id TEXT PRIMARY KEY,
+    artist_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    year INTEGER,
+    label TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS album_styles (
+    album_id TEXT NOT NULL,
+    style TEXT NOT NULL,
+    PRIMARY KEY (album_id, style)
+);
+CREATE TABLE IF NOT EXISTS tracks (
+    album_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    number INTEGER,
+    title TEXT,
+    duration TEXT,
+    PRIMARY KEY (album_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_artists_name ON artists (name);
+CREATE INDEX IF NOT EXISTS idx_albums_artist ON albums (artist_id);
+CREATE INDEX IF NOT EXISTS idx_albums_name ON albums (name);
+CREATE INDEX IF NOT EXISTS idx_albums_year ON albums (year);
+CREATE INDEX IF NOT EXISTS idx_albums_label ON albums (label);
+CREATE INDEX IF NOT EXISTS idx_album_styles_style ON album_styles (style);
+CREATE INDEX IF NOT EXISTS idx_artist_members_member ON artist_members (member_id);
+"""
+
+UPSERT_ARTIST = """
+INSERT INTO artists (artist_id, name, genre, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (artist_id) DO UPDATE SET
+    name = excluded.name, genre = excluded.genre, updated_at = excluded.updated_at
+"""
+
+UPSERT_ALBUM = """
+INSERT INTO albums (album_id, artist_id, name, year, label, updated_at) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (album_id) DO UPDATE SET
+    artist_id = excluded.artist_id, name = excluded.name, year = excluded.year,
+    label = excluded.label, updated_at = excluded.updated_at
+"""
+
+
+class SQLiteSink:
+    """
+    Sink alternativo ao JSONL: grava artistas, álbuns, faixas, membros e estilos
+    em tabelas normalizadas. Upserts por artist_id/album_id evitam duplicação
+    entre coletas repetidas; linhas filhas são substituídas a cada upsert.
+    """
+    def __init__(self, db_path: str, batch_size: int = 500):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        # isolation_level=None: transações controladas explicitamente com BEGIN/COMMIT
+        self.conn = sqlite3.connect(db_path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def write_artists(self, artists: Iterable[Artist]) -> int:
+        return self.upsert_records(artist.to_dict() for artist in artists)
+
+    def upsert_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Aceita registros no schema do JSONL, gravados em lotes de batch_size por transação"""
+        total = 0
+        batch: List[Dict[str, Any]] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                total += self._write_batch(batch)
+                batch = []
+        if batch:
+            total += self._write_batch(batch)
+        return total
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> int:
+        now = datetime.now().isoformat()
+        artist_rows, member_rows, website_rows = [], [], []
+        album_rows, style_rows, track_rows = [], [], []
+
+        for record in records:
+            artist_id = record['id']
+            artist_rows.append((artist_id, record['name'], record.get('genre'), now))
+
+            member_ids = record.get('member_ids') or []
+            for position, member_name in enumerate(record.get('members') or []):
+                # member_ids é alinhado com members (None para membros sem id)
+                member_id = member_ids[position] if position < len(member_ids) else None
+                member_rows.append((artist_id, position, member_name, member_id))
+
+            for url in dict.fromkeys(record.get('websites') or []):
+                website_rows.append((artist_id, url))
+
+            for album in record.get('albums') or []:
+                album_id = album['id']
+                album_rows.append((album_id, artist_id, album['name'], album.get('year'), album.get('label'), now))
+                for style in dict.fromkeys(album.get('styles') or []):
+                    style_rows.append((album_id, style))
+                for position, track in enumerate(album.get('tracks') or []):
+                    track_rows.append((album_id, position, track.get('number'), track.get('title'), track.get('duration')))
+
+        artist_keys = [(row[0],) for row in artist_rows]
+        album_keys = [(row[0],) for row in album_rows]
+
+        cursor = self.conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            cursor.executemany(UPSERT_ARTIST, artist_rows)
+            cursor.executemany(UPSERT_ALBUM, album_rows)
+
+            cursor.executemany("DELETE FROM artist_members WHERE artist_id = ?", artist_keys)
+            cursor.executemany("DELETE FROM artist_websites WHERE artist_id = ?", artist_keys)
+            cursor.executemany("DELETE FROM album_styles WHERE album_id = ?", album_keys)
+            cursor.executemany("DELETE FROM tracks WHERE album_id = ?", album_keys)
+
+            cursor.executemany("INSERT OR REPLACE INTO artist_members VALUES (?, ?, ?, ?)", member_rows)
+            cursor.executemany("INSERT OR IGNORE INTO artist_websites VALUES (?, ?)", website_rows)
+            cursor.executemany("INSERT OR IGNORE INTO album_styles VALUES (?, ?)", style_rows)
+            cursor.executemany("INSERT OR REPLACE INTO tracks VALUES (?, ?, ?, ?, ?)", track_rows)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+        return len(records)
@@ -0,0 +1,273 @@
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import pytest
+from src.scraper.api_client import DiscogsApiClient, RateLimiter
+from src.scraper.backend import DiscogsScraperError, DeadlineExceededError
+from src.scraper.scheduler import CrawlBudget
+
+RESPONSES = {
+    '/database/search': {
+        'pagination': {'pages': 1},
+        'results': [{'id': 10}, {'id': 11}, {'id': 12}]
+    },
+    '/masters/10': {'artists': [{'id': 1, 'name': 'The Band'}]},
+    '/masters/11': {'artists': [{'id': 1, 'name': 'The Band'}]},
+    '/masters/12': {'artists': [{'id': 2, 'name': 'Solo'}]},
+    '/artists/1': {
+        'name': 'The Band',
+        'members': [{'id': 3, 'name': 'Member A'}, {'name': 'Session Player'}, {'id': 4, 'name': 'Member B'}],
+        'groups': [{'id': 5, 'name': 'Supergroup'}],
+        'urls': ['https://theband.com', 'https://www.discogs.com/artist/1', 'https://theband.com']
+    },
+    '/artists/1/releases': {
+        'releases': [
+            {'id': 100, 'type': 'master', 'main_release': 1000, 'role': 'Main'},
+            {'id': 1001, 'type': 'release', 'role': 'Main', 'format': 'CD, Album'},
+            {'id': 1002, 'type': 'release', 'role': 'Appearance', 'format': 'CD, Album'},
+            {'id': 101, 'type': 'master', 'main_release': 1000, 'role': 'Main'},
+            {'id': 1003, 'type': 'release', 'role': 'Main', 'format': '7", Single'},
+            {'id': 102, 'type': 'master', 'main_release': 1004, 'role': 'Main'},
+        ]
+    },
+    '/releases/1004': {
+        'title': 'Greatest Hits',
+        'formats': [{'name': 'CD', 'descriptions': ['Compilation']}],
+        'tracklist': []
+    },
+    '/releases/1000': {
+        'title': 'First Album',
+        'year': 0,
+        'formats': [{'name': 'Vinyl', 'descriptions': ['LP', 'Album']}],
+        'labels': [{'name': 'Label X'}],
+        'styles': ['Pop Rock'],
+        'tracklist': [
+            {'position': '', 'type_': 'heading', 'title': 'Side A'},
+            {'position': '1', 'type_': 'track', 'title': 'Song 1', 'duration': '3:45'},
+            {'position': 'A2', 'type_': 'track', 'title': 'Song 2', 'duration': ''},
+        ]
+    },
+}
+
+
+class FakeDiscogsHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        path = urlsplit(self.path).path
+
+        if server.throttle_next:
+            server.throttle_next -= 1
+            self._send(429, headers={'Retry-After': '7'})
+            return
+
+        if path == '/etag':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self._send(304, headers={'ETag': '"v1"'})
+            else:
+                self._send(200, json.dumps({'value': 1}).encode(), {'ETag': '"v1"'})
+            return
+
+        payload = RESPONSES.get(path)
+        if payload is None:
+            self._send(404)
+            return
+        self._send(200, json.dumps(payload).encode(), {
+            'X-Discogs-Ratelimit': '60',
+            'X-Discogs-Ratelimit-Remaining': str(server.remaining),
+        })
+
+
+class TestDiscogsApiClient:
+    @pytest.fixture
+    def server(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), FakeDiscogsHandler)
+        server.requests = []
+        server.throttle_next = 0
+        server.remaining = 50
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture
+    def sleeps(self):
+        return []
+
+    @pytest.fixture
+    def tmpdir(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield tmpdir
+
+    @pytest.fixture
+    def make_client(self, server, sleeps, tmpdir):
+        clients = []
+
+        def make_client():
+            api_url = f"http://127.0.0.1:{server.server_address[1]}"
+            limiter = RateLimiter(reserve=5, sleep=sleeps.append)
+            client = DiscogsApiClient(api_url=api_url, token="secret", rate_limiter=limiter,
+                                      cache_path=os.path.join(tmpdir, "api_cache.db"))
+            clients.append(client)
+            return client
+
+        yield make_client
+        for client in clients:
+            client.close()
+
+    @pytest.fixture
+    def client(self, make_client):
+        return make_client()
+
+    def test_search_artists_by_genre(self, client, server):
+        urls = client.search_artists_by_genre("pop", limit=5)
+
+        assert urls == ["https://www.discogs.com/artist/1", "https://www.discogs.com/artist/2"]
+        assert 'genre=Pop' in server.requests[0][0]
+
+    def test_scrape_artist_info(self, client, server):
+        artist = client.scrape_artist_info("https://www.discogs.com/artist/1-The-Band", "Pop", include_albums=False)
+
+        assert artist.name == "The Band"
+        assert artist.members == ["Member A", "Session Player", "Member B"]
+        assert artist.member_ids == ["discogs-artist-3", None, "discogs-artist-4"]
+        assert artist.group_ids == ["discogs-artist-5"]
+        assert artist.websites == ["https://theband.com"]
+        assert artist.artist_id == "discogs-artist-1"
+
+        headers = server.requests[0][1]
+        assert headers['Authorization'] == "Discogs token=secret"
+        assert headers['User-Agent']
+
+    def test_list_artist_album_urls_main_albums_only(self, client):
+        urls = client.list_artist_album_urls("https://www.discogs.com/artist/1", max_albums=10)
+
+        # Sem participações, singles e compilações (formato do master vem do release principal)
+        assert urls == ["https://www.discogs.com/release/1000", "https://www.discogs.com/release/1001"]
+
+    def test_rejected_master_payload_not_kept(self, client):
+        client.list_artist_album_urls("https://www.discogs.com/artist/1", max_albums=10)
+
+        # O release 1004 (compilação) foi baixado para checar o formato, mas não é coletado
+        assert list(client._release_payloads) == ["1000"]
+
+    def test_master_release_payload_reused(self, client, server):
+        urls = client.list_artist_album_urls("https://www.discogs.com/artist/1", max_albums=1)
+        requests_before = len(server.requests)
+
+        album = client.scrape_album_details(urls[0])
+
+        assert album.name == "First Album"
+        assert len(server.requests) == requests_before
+
+    def test_scrape_album_details(self, client):
+        album = client.scrape_album_details("https://www.discogs.com/release/1000")
+
+        assert album.name == "First Album"
+        assert album.year is None
+        assert album.label == "Label X"
+        assert album.styles == ["Pop Rock"]
+        assert [(t.number, t.title) for t in album.tracks] == [(1, "Song 1"), (2, "Song 2")]
+        assert album.album_id == "discogs-release-1000"
+
+    def test_missing_resource_returns_none(self, client):
+        assert client.scrape_album_details("https://www.discogs.com/release/999") is None
+
+    def test_conditional_request_reuses_cached_body(self, client, server):
+        assert client._get_json('/etag') == {'value': 1}
+        assert client._get_json('/etag') == {'value': 1}
+
+        assert client.not_modified == 1
+        assert server.requests[1][1]['If-None-Match'] == '"v1"'
+
+    def test_validators_persist_across_runs(self, make_client, server):
+        first_run = make_client()
+        assert first_run._get_json('/etag') == {'value': 1}
+        first_run.close()
+
+        second_run = make_client()
+        assert second_run._get_json('/etag') == {'value': 1}
+        assert second_run.not_modified == 1
+        assert server.requests[-1][1]['If-None-Match'] == '"v1"'
+
+    def test_without_cache_path_requests_are_unconditional(self, server):
+        client = DiscogsApiClient(api_url=f"http://127.0.0.1:{server.server_address[1]}", cache_path=None)
+        client._get_json('/etag')
+        client._get_json('/etag')
+        client.close()
+
+        assert 'If-None-Match' not in server.requests[-1][1]
+        assert client.not_modified == 0
+
+    def test_connection_is_reused(self, client):
+        client.scrape_artist_info("https://www.discogs.com/artist/1", "Pop")
+
+        assert client.requests_made > 2
+        assert client.pool.connections_created == 1
+
+    def test_waits_retry_after_on_429(self, client, server, sleeps):
+        server.throttle_next = 1
+
+        assert client.scrape_album_details("https://www.discogs.com/release/1000") is not None
+        assert sleeps == [7.0]
+
+    def test_no_request_after_deadline(self, client, server):
+        client.budget = CrawlBudget(deadline_seconds=0)
+
+        with pytest.raises(DeadlineExceededError):
+            client.scrape_album_details("https://www.discogs.com/release/1000")
+        assert server.requests == []
+
+    def test_retry_after_beyond_deadline_is_not_awaited(self, client, server, sleeps):
+        server.throttle_next = 1
+        client.budget = CrawlBudget(deadline_seconds=3)
+
+        with pytest.raises(DeadlineExceededError):
+            client.scrape_album_details("https://www.discogs.com/release/1000")
+        assert sleeps == []
+        assert len(server.requests) == 1
+
+    def test_gives_up_after_max_retries(self, client, server):
+        server.throttle_next = 10
+
+        with pytest.raises(DiscogsScraperError):
+            client.scrape_album_details("https://www.discogs.com/release/1000")
+
+
+class TestRateLimiter:
+    def test_no_wait_while_quota_available(self):
+        sleeps = []
+        limiter = RateLimiter(reserve=5, sleep=sleeps.append, clock=lambda: 100.0)
+        limiter.update({'X-Discogs-Ratelimit': '60', 'X-Discogs-Ratelimit-Remaining': '30'})
+
+        limiter.wait()
+        limiter.wait()
+
+        assert sleeps == []
+
+    def test_spaces_requests_near_limit(self):
+        sleeps = []
+        limiter = RateLimiter(reserve=5, sleep=sleeps.append, clock=lambda: 100.0)
+        limiter.wait()
+        limiter.update({'X-Discogs-Ratelimit': '60', 'X-Discogs-Ratelimit-Remaining': '2'})
+
+        limiter.wait()
+
+        assert sleeps == [1.0]
@@ -0,0 +1,143 @@
+import pytest
+from src.scraper.backend import ScraperBackend
+from src.scraper.data_models import Artist
+from src.scraper.entity_cache import discogs_id_from_url
+from src.scraper.scheduler import CrawlBudget
+
+# id -> (nome, ids dos membros, ids dos grupos)
+GRAPH = {
+    '1': ('The Band', ['2', '3'], []),
+    '2': ('Member A', [], ['1', '4']),
+    '3': ('Member B', [], ['1']),
+    '4': ('Side Project', ['2', '5'], []),
+    '5': ('Member C', [], ['4']),
+}
+
+
+class FakeBackend(ScraperBackend):
+    def __init__(self):
+        super().__init__()
+        self.profile_calls = []
+
+    def search_artists_by_genre(self, genre, limit=10):
+        return [f"{self.base_url}/artist/1"][:limit]
+
+    def scrape_artist_info(self, artist_url, genre, include_albums=True):
+        discogs_id = discogs_id_from_url(artist_url)
+        self.profile_calls.append(discogs_id)
+        name, member_ids, group_ids = GRAPH[discogs_id]
+        return Artist(
+            name=name,
+            genre=genre,
+            url=artist_url,
+            member_ids=[f"discogs-artist-{i}" for i in member_ids],
+            group_ids=[f"discogs-artist-{i}" for i in group_ids]
+        )
+
+    def list_artist_album_urls(self, artist_url, max_albums=10):
+        return []
+
+    def scrape_album_details(self, album_url):
+        return None
+
+
+class TestCrawlArtistGraph:
+    def test_depth_zero_only_seeds(self):
+        backend = FakeBackend()
+
+        artists = backend.crawl_artist_graph([f"{backend.base_url}/artist/1"], "Rock", max_depth=0)
+
+        assert [a.name for a in artists] == ["The Band"]
+
+    def test_expands_members_and_groups_breadth_first(self):
+        backend = FakeBackend()
+
+        artists = backend.crawl_artist_graph([f"{backend.base_url}/artist/1"], "Rock", max_depth=2)
+
+        assert [a.name for a in artists] == ["The Band", "Member A", "Member B", "Side Project"]
+
+    def test_each_artist_collected_once(self):
+        backend = FakeBackend()
+
+        artists = backend.crawl_artist_graph(
+            [f"{backend.base_url}/artist/1", f"{backend.base_url}/artist/2-member-a"], "Rock", max_depth=5
+        )
+
+        assert sorted(a.artist_id for a in artists) == [f"discogs-artist-{i}" for i in "12345"]
+        assert sorted(backend.profile_calls) == ["1", "2", "3", "4", "5"]
+
+    def test_related_artists_have_no_search_genre(self):
+        backend = FakeBackend()
+
+        artists = backend.crawl_artist_graph([f"{backend.base_url}/artist/1"], "Rock", max_depth=1)
+
+        assert {a.name: a.genre for a in artists} == {"The Band": "Rock", "Member A": "", "Member B": ""}
+
+    def test_scrape_genre_data_uses_graph_depth(self):
+        backend = FakeBackend()
+
+        artists = backend.scrape_genre_data("Rock", max_artists=1, graph_depth=1)
+
+        assert len(artists) == 3
+
+
+class TestScraperBackend:
+    def test_partial_backend_fails_on_creation(self):
+        class SearchOnly(ScraperBackend):
+            def search_artists_by_genre(self, genre, limit=10):
+                return []
+
+        with pytest.raises(TypeError):
+            SearchOnly()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowPageBackend(FakeBackend):
+    """Cada artista exige duas páginas; a primeira página do artista 1 passa do prazo"""
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+        self.pages = []
+        self.waits = []
+
+    def _get_page(self, url):
+        self._check_deadline(url)
+        self.waits.append(self._capped(30))
+        self.pages.append(url)
+        if url.endswith('/artist/1'):
+            self.clock.now = 60
+
+    def scrape_artist_info(self, artist_url, genre, include_albums=True):
+        self._get_page(artist_url)
+        self._get_page(f"{artist_url}/groups")
+        return super().scrape_artist_info(artist_url, genre, include_albums)
+
+
+class TestDeadlinePropagation:
+    def test_task_overrunning_deadline_stops_requests(self):
+        clock = FakeClock()
+        backend = SlowPageBackend(clock)
+        budget = CrawlBudget(deadline_seconds=5, clock=clock)
+
+        artists = backend.scrape_genre_data("Rock", max_artists=1, budget=budget)
+
+        # A segunda página do artista não é carregada depois do prazo e a coleta encerra
+        assert backend.pages == [f"{backend.base_url}/artist/1"]
+        assert backend.waits == [5]
+        assert artists == []
+        assert backend.budget is None
+
+    def test_requests_without_budget_are_not_capped(self):
+        backend = SlowPageBackend(FakeClock())
+
+        artists = backend.scrape_genre_data("Rock", max_artists=1)
+
+        assert [a.name for a in artists] == ["The Band"]
+        assert backend.waits == [30, 30]
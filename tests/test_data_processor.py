@@ -2,7 +2,13 @@ import pytest
 import tempfile
 import os
 import json
+import sqlite3
 from src.utils.data_processor import DataProcessor
+from src.utils.shard_writer import (
+    read_manifest, shard_paths, verify_shards, iter_shard_records,
+    iter_records_parallel, map_shards
+)
+from src.utils.serialization import dumps_line
 from src.scraper.data_models import Artist, Album, Track
 
 class TestDataProcessor:
@@ -28,6 +34,8 @@ class TestDataProcessor:
         artist1 = Artist(
             name="Artist 1",
             genre="Rock",
+            members=["Member 1"],
+            member_ids=["discogs-artist-222"],
             websites=["http://artist1.com"],
             url="https://www.discogs.com/artist/67890-artist-1"
         )
@@ -80,6 +88,7 @@ class TestDataProcessor:
             assert artist1_data['albums'][0]['name'] == "Album 1"
             assert artist1_data['albums'][0]['id'] == "discogs-release-12345"
             assert len(artist1_data['albums'][0]['tracks']) == 2
+            assert artist1_data['member_ids'] == ["discogs-artist-222"]
             
             artist2_data = json.loads(lines[1])
             assert artist2_data['name'] == "Artist 2"
@@ -111,6 +120,15 @@ class TestDataProcessor:
             for website in data['websites']:
                 assert 'discogs' not in website.lower()
     
+    def test_jsonl_lines_match_to_dict(self, processor, sample_artists):
+        output_file = processor.artists_to_jsonl(sample_artists, "schema.jsonl")
+        
+        with open(output_file, 'rb') as f:
+            lines = f.readlines()
+        
+        assert lines == [dumps_line(artist.to_dict()) for artist in sample_artists]
+        assert json.loads(lines[0]) == sample_artists[0].to_dict()
+    
     def test_generate_summary_report(self, processor, sample_artists):
         report = processor.generate_summary_report(sample_artists)
         
@@ -143,4 +161,76 @@ class TestDataProcessor:
         report = processor.generate_summary_report([])
         assert report['summary']['total_artists'] == 0
         assert report['summary']['total_albums'] == 0
-        assert report['summary']['total_tracks'] == 0
\ No newline at end of file
+        assert report['summary']['total_tracks'] == 0
+    
+    def test_artists_to_jsonl_shards_rotation(self, processor, sample_artists):
+        artists = sample_artists * 3
+        manifest_file = processor.artists_to_jsonl_shards(artists, "sharded", "gzip", max_records=4)
+        
+        manifest = read_manifest(manifest_file)
+        assert manifest['total_records'] == 6
+        assert [shard['records'] for shard in manifest['shards']] == [4, 2]
+        assert all(shard['file'].endswith('.jsonl.gz') for shard in manifest['shards'])
+        assert verify_shards(manifest_file)
+        
+        records = [r for path in shard_paths(manifest_file) for r in iter_shard_records(path)]
+        assert [r['id'] for r in records] == [a.artist_id for a in artists]
+    
+    def test_shards_rotate_by_bytes(self, processor, sample_artists):
+        manifest_file = processor.artists_to_jsonl_shards(sample_artists, "by_bytes", "none", max_bytes=1)
+        
+        manifest = read_manifest(manifest_file)
+        assert len(manifest['shards']) == 2
+        assert all(shard['records'] == 1 for shard in manifest['shards'])
+    
+    def test_shards_parallel_readers(self, processor, sample_artists):
+        manifest_file = processor.artists_to_jsonl_shards(sample_artists * 5, "parallel", max_records=3)
+        
+        records = list(iter_records_parallel(manifest_file, max_workers=3, buffer_size=2))
+        assert len(records) == 10
+        
+        counts = map_shards(manifest_file, lambda path: sum(1 for _ in iter_shard_records(path)))
+        assert counts == [3, 3, 3, 1]
+    
+    def test_artists_to_sqlite_upserts(self, processor, sample_artists):
+        db_path = os.path.join(processor.output_dir, "discogs.db")
+        
+        processor.artists_to_sqlite(sample_artists, db_path)
+        sample_artists[0].albums[0].tracks = sample_artists[0].albums[0].tracks[:1]
+        processor.artists_to_sqlite(sample_artists, db_path)
+        
+        conn = sqlite3.connect(db_path)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM artists").fetchone()[0] == 2
+            assert conn.execute("SELECT COUNT(*) FROM albums").fetchone()[0] == 3
+            assert conn.execute(
+                "SELECT COUNT(*) FROM tracks WHERE album_id = 'discogs-release-12345'"
+            ).fetchone()[0] == 1
+            assert conn.execute(
+                "SELECT member_name, member_id FROM artist_members WHERE artist_id = 'discogs-artist-67890'"
+            ).fetchall() == [("Member 1", "discogs-artist-222")]
+            assert conn.execute(
+                "SELECT a.name FROM albums a JOIN album_styles s ON s.album_id = a.album_id WHERE s.style = 'Jazz'"
+            ).fetchall() == [("Album 2",)]
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            conn.close()
+    
+    def test_sqlite_members_without_id_keep_alignment(self, processor):
+        db_path = os.path.join(processor.output_dir, "discogs.db")
+        artist = Artist(
+            name="Band", genre="Rock",
+            members=["No Id", "With Id"],
+            member_ids=[None, "discogs-artist-7"],
+            url="https://www.discogs.com/artist/1-band"
+        )
+        
+        processor.artists_to_sqlite([artist], db_path)
+        
+        conn = sqlite3.connect(db_path)
+        try:
+            assert conn.execute(
+                "SELECT member_name, member_id FROM artist_members ORDER BY position"
+            ).fetchall() == [("No Id", None), ("With Id", "discogs-artist-7")]
+        finally:
+            conn.close()
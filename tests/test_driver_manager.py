@@ -0,0 +1,152 @@
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from src.scraper import driver_manager
+from src.scraper.driver_manager import (DriverManager, DriverHangError, DriverDeadlineError,
+                                        descendant_pids, process_tree_rss_mb)
+
+class FakeDriver:
+    def __init__(self, hang_urls=(), hang_once=False):
+        self.hang_urls = set(hang_urls)
+        self.hang_once = hang_once
+        self.loaded = []
+        self.quit_called = False
+        self.page_load_timeout = None
+        self._release = threading.Event()
+    
+    def set_page_load_timeout(self, seconds):
+        self.page_load_timeout = seconds
+    
+    def get(self, url):
+        if url in self.hang_urls:
+            self._release.wait(5)
+            return
+        self.loaded.append(url)
+    
+    def quit(self):
+        self.quit_called = True
+        self._release.set()
+
+class TestDriverManager:
+    def test_recycles_after_max_pages(self):
+        drivers = []
+        
+        def factory():
+            drivers.append(FakeDriver())
+            return drivers[-1]
+        
+        manager = DriverManager(factory, max_pages=2, max_rss_mb=0, page_load_timeout=30)
+        for i in range(5):
+            manager.get(f"https://www.discogs.com/page/{i}")
+        
+        assert len(drivers) == 3
+        assert drivers[0].quit_called and drivers[1].quit_called
+        assert drivers[0].loaded == ["https://www.discogs.com/page/0", "https://www.discogs.com/page/1"]
+        assert drivers[2].loaded == ["https://www.discogs.com/page/4"]
+        assert drivers[0].page_load_timeout == 30
+    
+    def test_recycles_when_rss_exceeds_threshold(self, monkeypatch):
+        drivers = []
+        
+        def factory():
+            drivers.append(FakeDriver())
+            return drivers[-1]
+        
+        manager = DriverManager(factory, max_pages=0, max_rss_mb=100)
+        monkeypatch.setattr(manager, 'rss_mb', lambda: 250.0)
+        
+        manager.get("https://www.discogs.com/a")
+        manager.get("https://www.discogs.com/b")
+        
+        assert len(drivers) == 2
+        assert manager.restarts == 1
+    
+    def test_hang_kills_and_retries_in_flight_url(self):
+        drivers = []
+        
+        def factory():
+            # Só o primeiro navegador trava
+            hang_urls = ["https://www.discogs.com/slow"] if not drivers else []
+            drivers.append(FakeDriver(hang_urls))
+            return drivers[-1]
+        
+        manager = DriverManager(factory, max_pages=0, max_rss_mb=0, hang_timeout=0.2)
+        driver = manager.get("https://www.discogs.com/slow")
+        
+        assert driver is drivers[1]
+        assert drivers[1].loaded == ["https://www.discogs.com/slow"]
+        assert manager.restarts == 1
+    
+    def test_hang_gives_up_after_retries(self):
+        manager = DriverManager(lambda: FakeDriver(["https://www.discogs.com/slow"]),
+                                max_pages=0, max_rss_mb=0, hang_timeout=0.1, max_hang_retries=1)
+        
+        with pytest.raises(DriverHangError):
+            manager.get("https://www.discogs.com/slow")
+        assert manager.restarts == 2
+    
+    def test_deadline_aborts_load_without_retry(self):
+        drivers = []
+        deadline = time.monotonic() + 0.2
+        
+        def factory():
+            drivers.append(FakeDriver(["https://www.discogs.com/slow"]))
+            return drivers[-1]
+        
+        manager = DriverManager(factory, max_pages=0, max_rss_mb=0, hang_timeout=30,
+                                time_left=lambda: max(deadline - time.monotonic(), 0.0))
+        started_at = time.monotonic()
+        with pytest.raises(DriverDeadlineError):
+            manager.get("https://www.discogs.com/slow")
+        
+        # Aborta no prazo, não no hang_timeout, e não recria o navegador para tentar de novo
+        assert time.monotonic() - started_at < 5
+        assert len(drivers) == 1 and drivers[0].quit_called
+        with pytest.raises(DriverDeadlineError):
+            manager.get("https://www.discogs.com/other")
+        assert len(drivers) == 1
+
+class TestProcessTree:
+    @pytest.fixture
+    def process_tree(self):
+        # pai -> filho -> neto, todos dormindo até serem encerrados
+        parent = subprocess.Popen([
+            sys.executable, '-c',
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', "
+            "'import subprocess, sys, time; subprocess.Popen([sys.executable, \"-c\", \"import time; time.sleep(30)\"]); "
+            "print(1, flush=True); time.sleep(30)'], stdout=sys.stdout)\n"
+            "time.sleep(30)"
+        ], stdout=subprocess.PIPE)
+        parent.stdout.readline()
+        yield parent
+        for pid in descendant_pids([parent.pid]):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        parent.kill()
+        parent.wait()
+    
+    @pytest.mark.skipif(not os.path.exists('/proc'), reason="requer /proc")
+    def test_descendants_found_in_one_pass(self, process_tree, monkeypatch):
+        stat_reads = []
+        original_open = open
+        
+        def counting_open(path, *args, **kwargs):
+            if isinstance(path, str) and path.endswith('/stat'):
+                stat_reads.append(path)
+            return original_open(path, *args, **kwargs)
+        
+        monkeypatch.setattr(driver_manager, 'psutil', None)
+        monkeypatch.setattr('builtins.open', counting_open)
+        descendants = descendant_pids([process_tree.pid])
+        monkeypatch.undo()
+        
+        assert len(descendants) == 2
+        assert len(stat_reads) == len(set(stat_reads))
+        assert process_tree_rss_mb(process_tree.pid) > process_tree_rss_mb(descendants[-1])
@@ -0,0 +1,36 @@
+from src.scraper.entity_cache import EntityCache, discogs_id_from_url
+from src.scraper.data_models import Artist
+
+class TestEntityCache:
+    def test_discogs_id_from_url(self):
+        assert discogs_id_from_url("https://www.discogs.com/artist/3840-Radiohead") == "3840"
+        assert discogs_id_from_url("https://www.discogs.com/release/12345-x", "release") == "12345"
+        assert discogs_id_from_url("https://www.discogs.com/search/") is None
+    
+    def test_loader_called_once_per_id(self):
+        cache = EntityCache()
+        calls = []
+        
+        def loader():
+            calls.append(1)
+            return Artist(name="Thom Yorke", genre="Rock", url="https://www.discogs.com/artist/100-thom")
+        
+        first = cache.get_or_load("100", loader)
+        second = cache.get_or_load(100, loader)
+        
+        assert first is second
+        assert len(calls) == 1
+        assert cache.stats() == {'entities': 1, 'hits': 1, 'misses': 1}
+    
+    def test_failed_load_is_cached(self):
+        cache = EntityCache()
+        calls = []
+        
+        def loader():
+            calls.append(1)
+            return None
+        
+        assert cache.get_or_load("200", loader) is None
+        assert cache.get_or_load("200", loader) is None
+        assert len(calls) == 1
+        assert "200" in cache
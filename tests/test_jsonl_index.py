@@ -0,0 +1,51 @@
+import os
+import tempfile
+import pytest
+from src.utils.data_processor import DataProcessor
+from src.utils.jsonl_index import build_index, JsonlIndexReader
+from src.scraper.data_models import Artist, Album, Track
+
+class TestJsonlIndex:
+    @pytest.fixture
+    def jsonl_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            artists = []
+            for i in range(1, 4):
+                artist = Artist(
+                    name=f"Artist {i}",
+                    genre="Rock",
+                    url=f"https://www.discogs.com/artist/{i}-artist"
+                )
+                artist.add_album(Album(
+                    name=f"Álbum {i}",
+                    year=2000 + i,
+                    tracks=[Track(number=1, title="Faixa")],
+                    url=f"https://www.discogs.com/release/{i * 100}-album"
+                ))
+                artists.append(artist)
+            yield DataProcessor(tmpdir).artists_to_jsonl(artists, "indexed.jsonl")
+    
+    def test_point_lookups(self, jsonl_file):
+        index_file = build_index(jsonl_file)
+        assert os.path.exists(index_file)
+        
+        with JsonlIndexReader(jsonl_file) as reader:
+            artist = reader.get_artist("discogs-artist-2")
+            assert artist['name'] == "Artist 2"
+            
+            album = reader.get_album("discogs-release-300")
+            assert album['name'] == "Álbum 3"
+            assert album['artist_id'] == "discogs-artist-3"
+            
+            assert reader.get_artist("discogs-artist-999") is None
+            assert reader.get_album("discogs-release-999") is None
+            assert "discogs-release-100" in reader
+    
+    def test_stale_index_is_rebuilt(self, jsonl_file):
+        build_index(jsonl_file)
+        
+        with open(jsonl_file, 'ab') as f:
+            f.write(b'{"id":"discogs-artist-4","name":"Artist 4","albums":[]}\n')
+        
+        with JsonlIndexReader(jsonl_file) as reader:
+            assert reader.get_artist("discogs-artist-4")['name'] == "Artist 4"
@@ -0,0 +1,52 @@
+import json
+import logging
+import os
+import tempfile
+from src.utils.logging_setup import JsonFormatter, SamplingFilter, setup_logging, shutdown_logging
+
+def make_record(msg, level=logging.INFO, **extra):
+    record = logging.LogRecord("src.scraper.scraper", level, __file__, 1, msg, (), None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+class TestLoggingSetup:
+    def test_json_formatter_includes_structured_fields(self):
+        record = make_record("Página carregada: %s", url="https://www.discogs.com/artist/1", elapsed_ms=1200)
+        record.args = ("Radiohead",)
+        
+        entry = json.loads(JsonFormatter().format(record))
+        
+        assert entry['message'] == "Página carregada: Radiohead"
+        assert entry['url'] == "https://www.discogs.com/artist/1"
+        assert entry['elapsed_ms'] == 1200
+        assert 'stage' not in entry
+    
+    def test_sampling_filter(self):
+        sampling = SamplingFilter(burst=3, rate=5)
+        
+        passed = sum(sampling.filter(make_record("por página", sampled=True)) for _ in range(23))
+        assert passed == 3 + 4
+        
+        assert all(sampling.filter(make_record("sem amostragem")) for _ in range(10))
+        assert sampling.filter(make_record("por página", level=logging.WARNING, sampled=True))
+    
+    def test_queue_pipeline_writes_json_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = os.path.join(tmpdir, "scraper.log")
+            setup_logging("INFO", log_file, sample_burst=1, sample_rate=100)
+            try:
+                logger = logging.getLogger("src.scraper.scraper")
+                for i in range(5):
+                    logger.info("Página %d", i, extra={'url': f"https://x/{i}", 'stage': 'request', 'sampled': True})
+                logger.error("Falha", extra={'stage': 'album'})
+            finally:
+                shutdown_logging()
+                logging.getLogger().handlers.clear()
+            
+            with open(log_file, 'r', encoding='utf-8') as f:
+                entries = [json.loads(line) for line in f]
+            
+            assert [entry['message'] for entry in entries] == ["Página 0", "Falha"]
+            assert entries[0]['stage'] == 'request'
+            assert entries[1]['level'] == 'ERROR'
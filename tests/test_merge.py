@@ -0,0 +1,196 @@
+import gzip
+import json
+import os
+import tempfile
+import pytest
+from src.utils.data_processor import DataProcessor
+from src.utils.merge import RecordMerger, merge_outputs, merge_records, report_path_for, MergeStats
+from src.utils.shard_writer import iter_shard_records, read_manifest
+from src.scraper.data_models import Artist, Album, Track
+
+
+def write_jsonl(path, records):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'wt', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def artist_record(artist_id, name, **fields):
+    record = {'id': f"discogs-artist-{artist_id}", 'name': name, 'genre': 'Rock',
+              'members': [], 'member_ids': [], 'group_ids': [], 'websites': [], 'albums': []}
+    record.update(fields)
+    return record
+
+
+class TestRecordMerger:
+    def test_non_empty_keeps_first_filled_value(self):
+        merged = RecordMerger('non_empty').merge([
+            artist_record(1, 'Band', genre=''),
+            artist_record(1, 'Band (renamed)', genre='Jazz'),
+        ])
+
+        assert merged['name'] == 'Band'
+        assert merged['genre'] == 'Jazz'
+
+    def test_first_and_last_policies(self):
+        records = [artist_record(1, 'Old', genre='Rock'), artist_record(1, 'New', genre='')]
+
+        assert RecordMerger('first').merge(records)['genre'] == 'Rock'
+        assert RecordMerger('last').merge(records)['genre'] == ''
+        assert RecordMerger('last').merge(records)['name'] == 'New'
+
+    def test_list_fields_are_united(self):
+        merged = RecordMerger().merge([
+            artist_record(1, 'Band', members=['A', 'B'], websites=['https://a.com']),
+            artist_record(1, 'Band', members=['B', 'C'], websites=['https://b.com']),
+        ])
+
+        assert merged['members'] == ['A', 'B', 'C']
+        assert merged['websites'] == ['https://a.com', 'https://b.com']
+
+    def test_members_merged_with_their_ids(self):
+        merged = RecordMerger().merge([
+            artist_record(1, 'Band', members=['A', 'B'], member_ids=[None, 'discogs-artist-2']),
+            artist_record(1, 'Band', members=['C', 'A'], member_ids=['discogs-artist-3', 'discogs-artist-1']),
+        ])
+
+        assert merged['members'] == ['A', 'B', 'C']
+        assert merged['member_ids'] == ['discogs-artist-1', 'discogs-artist-2', 'discogs-artist-3']
+
+    def test_members_follow_chosen_record(self):
+        merged = RecordMerger('last', {'members': 'last'}).merge([
+            artist_record(1, 'Band', members=['A'], member_ids=['discogs-artist-1']),
+            artist_record(1, 'Band', members=['B', 'C'], member_ids=[None, 'discogs-artist-3']),
+        ])
+
+        assert merged['members'] == ['B', 'C']
+        assert merged['member_ids'] == [None, 'discogs-artist-3']
+
+    def test_albums_deduplicated_by_id(self):
+        album_a = {'id': 'discogs-release-1', 'name': 'A', 'year': None, 'label': None,
+                   'styles': ['Rock'], 'tracks': []}
+        album_a_full = {'id': 'discogs-release-1', 'name': 'A', 'year': 1999, 'label': 'L',
+                        'styles': ['Pop'], 'tracks': [{'number': 1, 'title': 'T', 'duration': '1:00'}]}
+        album_b = {'id': 'discogs-release-2', 'name': 'B', 'year': 2001, 'label': None,
+                   'styles': [], 'tracks': []}
+
+        merged = RecordMerger().merge([
+            artist_record(1, 'Band', albums=[album_a]),
+            artist_record(1, 'Band', albums=[album_a_full, album_b]),
+        ])
+
+        assert [album['id'] for album in merged['albums']] == ['discogs-release-1', 'discogs-release-2']
+        assert merged['albums'][0]['year'] == 1999
+        assert merged['albums'][0]['styles'] == ['Rock', 'Pop']
+        assert len(merged['albums'][0]['tracks']) == 1
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            RecordMerger('random')
+
+
+class TestMergeOutputs:
+    @pytest.fixture
+    def tmpdir(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield tmpdir
+
+    def test_k_way_merge_sorted_by_id(self, tmpdir):
+        first = os.path.join(tmpdir, 'a.jsonl')
+        second = os.path.join(tmpdir, 'b.jsonl.gz')
+        write_jsonl(first, [artist_record(i, f'A{i}') for i in (5, 1, 3, 9)])
+        write_jsonl(second, [artist_record(i, f'B{i}') for i in (2, 3, 8)])
+
+        stats = MergeStats()
+        records = list(merge_records([first, second], run_size=2, stats=stats))
+
+        ids = [record['id'] for record in records]
+        assert ids == sorted(ids)
+        assert len(ids) == 6
+        assert next(r for r in records if r['id'] == 'discogs-artist-3')['name'] == 'A3'
+        assert stats.input_records == 7
+        assert stats.duplicates == 1
+
+    def test_multi_pass_merge_above_fan_in(self, tmpdir):
+        paths = []
+        for source in range(4):
+            path = os.path.join(tmpdir, f'{source}.jsonl')
+            write_jsonl(path, [artist_record(i, f'S{source}-{i}') for i in range(source, 12, 2)])
+            paths.append(path)
+
+        stats = MergeStats()
+        merger = RecordMerger('first')
+        records = list(merge_records(paths, merger, run_size=1, fan_in=2, stats=stats))
+
+        ids = [record['id'] for record in records]
+        assert ids == sorted(ids) and len(ids) == 12
+        # Mesmo com passadas intermediárias, "first" continua sendo a primeira entrada
+        assert {r['id']: r['name'] for r in records}['discogs-artist-3'] == 'S1-3'
+        assert stats.input_records == 22
+        assert stats.duplicates == 10
+
+    def test_empty_merge_writes_valid_report(self, tmpdir):
+        path = os.path.join(tmpdir, 'empty.jsonl')
+        write_jsonl(path, [])
+
+        merge_outputs([path], os.path.join(tmpdir, 'merged.jsonl'))
+
+        with open(os.path.join(tmpdir, 'merged_report.json'), encoding='utf-8') as f:
+            assert json.load(f)['artist_details'] == []
+
+    def test_records_without_id_are_not_merged(self, tmpdir):
+        path = os.path.join(tmpdir, 'a.jsonl')
+        write_jsonl(path, [{'name': 'X'}, {'name': 'Y'}])
+
+        assert len(list(merge_records([path]))) == 2
+
+    def test_merges_data_processor_outputs_and_reports(self, tmpdir):
+        processor = DataProcessor(tmpdir)
+        album = Album(name="Album", year=2020, url="https://www.discogs.com/release/10",
+                      tracks=[Track(1, "T1", "3:00"), Track(2, "T2", "4:00")])
+        shared = Artist(name="Shared", genre="Rock", members=["A"],
+                        url="https://www.discogs.com/artist/1", albums=[album])
+        rock_only = Artist(name="Rock Only", genre="Rock", url="https://www.discogs.com/artist/2")
+        jazz_shared = Artist(name="Shared", genre="Jazz", members=["B"],
+                             url="https://www.discogs.com/artist/1", albums=[album])
+        jazz_only = Artist(name="Jazz Only", genre="Jazz", url="https://www.discogs.com/artist/3")
+
+        rock_file = processor.artists_to_jsonl([shared, rock_only], "rock.jsonl")
+        with open(report_path_for(rock_file), 'w', encoding='utf-8') as f:
+            json.dump(processor.generate_summary_report([shared, rock_only]), f)
+        jazz_manifest = processor.artists_to_jsonl_shards([jazz_shared, jazz_only], "jazz", max_records=1)
+        with open(report_path_for(jazz_manifest), 'w', encoding='utf-8') as f:
+            json.dump(processor.generate_summary_report([jazz_shared, jazz_only]), f)
+
+        output = os.path.join(tmpdir, 'merged.jsonl')
+        report = merge_outputs([rock_file, jazz_manifest], output)
+
+        records = list(iter_shard_records(output))
+        assert [r['id'] for r in records] == ['discogs-artist-1', 'discogs-artist-2', 'discogs-artist-3']
+        assert records[0]['genre'] == 'Rock'
+        assert records[0]['members'] == ['A', 'B']
+        assert len(records[0]['albums']) == 1
+
+        assert report['summary']['total_artists'] == 3
+        assert report['summary']['total_albums'] == 1
+        assert report['summary']['total_tracks'] == 2
+        assert report['summary']['duplicates_merged'] == 1
+        assert [source['file'] for source in report['sources']] == ['rock_report.json', 'jazz_report.json']
+        with open(os.path.join(tmpdir, 'merged_report.json'), encoding='utf-8') as f:
+            saved = json.load(f)
+        assert saved['summary'] == report['summary']
+        assert saved['sources'] == report['sources']
+        assert [detail['name'] for detail in saved['artist_details']] == ['Shared', 'Rock Only', 'Jazz Only']
+        assert saved['artist_details'][0]['members_count'] == 2
+
+    def test_sharded_output(self, tmpdir):
+        path = os.path.join(tmpdir, 'a.jsonl')
+        write_jsonl(path, [artist_record(i, f'A{i}') for i in range(5)])
+
+        merge_outputs([path], os.path.join(tmpdir, 'merged.jsonl'), max_records=2)
+
+        manifest = read_manifest(os.path.join(tmpdir, 'merged_manifest.json'))
+        assert manifest['total_records'] == 5
+        assert len(manifest['shards']) == 3
+        assert os.path.exists(os.path.join(tmpdir, 'merged_report.json'))
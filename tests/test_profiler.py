@@ -0,0 +1,39 @@
+import os
+import tempfile
+import time
+from src.utils.profiler import CrawlProfiler
+
+def busy_stage():
+    data = [str(i) * 10 for i in range(20000)]
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+    return data
+
+class TestCrawlProfiler:
+    def test_writes_folded_stacks_and_allocation_report(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            profiler = CrawlProfiler(interval=0.005)
+            profiler.start()
+            
+            kept = busy_stage()
+            profiler.snapshot("busca")
+            kept += busy_stage()
+            profiler.snapshot("exportação")
+            
+            folded_file, allocations_file = profiler.stop(os.path.join(tmpdir, "run"))
+            
+            with open(folded_file, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            assert lines
+            assert any('busy_stage' in line for line in lines)
+            stack, count = lines[0].rsplit(' ', 1)
+            assert int(count) > 0
+            assert ';' in stack
+            
+            with open(allocations_file, 'r', encoding='utf-8') as f:
+                report = f.read()
+            assert "== busca" in report
+            assert "== exportação" in report
+            assert "Crescimento desde a etapa anterior" in report
+            assert len(profiler.stages) == 2
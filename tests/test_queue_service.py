@@ -0,0 +1,102 @@
+import os
+import json
+import tempfile
+import pytest
+from src.scraper.work_queue import SQLiteWorkQueue
+from src.scraper.queue_service import (WorkQueueServer, HttpWorkQueue, WorkQueueServiceError,
+                                       open_work_queue)
+from src.scraper.worker import CrawlWorker
+from tests.test_work_queue import FakeClock, FakeScraper
+
+
+class TestHttpWorkQueue:
+    @pytest.fixture
+    def tmpdir(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield tmpdir
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def server(self, tmpdir, clock):
+        queue = SQLiteWorkQueue(os.path.join(tmpdir, "queue.db"), clock=clock)
+        with WorkQueueServer(queue, '127.0.0.1', 0, token="segredo") as server:
+            yield server
+
+    @pytest.fixture
+    def queue(self, server):
+        return HttpWorkQueue(server.url, token="segredo", timeout=5)
+
+    def test_claim_and_complete(self, queue):
+        assert queue.enqueue('artist', "https://www.discogs.com/artist/1-a", {'genre': 'Rock'})
+        assert not queue.enqueue('artist', "https://www.discogs.com/artist/1-a")
+
+        item = queue.claim("worker-a", lease_seconds=60, kinds=['artist'])
+        assert item.url == "https://www.discogs.com/artist/1-a"
+        assert item.payload == {'genre': 'Rock'}
+        assert item.worker_id == "worker-a"
+        assert queue.claim("worker-b", lease_seconds=60) is None
+
+        assert queue.complete(item.item_id, "worker-a")
+        assert queue.is_drained()
+        assert queue.stats() == {'pending': 0, 'leased': 0, 'done': 1, 'failed': 0}
+
+    def test_renew_keeps_lease(self, queue, clock):
+        queue.enqueue('artist', "https://www.discogs.com/artist/1-a")
+        item = queue.claim("worker-a", lease_seconds=60)
+
+        clock.now += 50
+        assert queue.renew(item.item_id, "worker-a", 60)
+        assert not queue.renew(item.item_id, "worker-b", 60)
+        clock.now += 50
+        assert queue.requeue_expired() == 0
+
+    def test_expired_lease_moves_to_other_worker(self, queue, clock):
+        queue.enqueue('artist', "https://www.discogs.com/artist/1-a")
+        item = queue.claim("worker-a", lease_seconds=60)
+
+        clock.now += 61
+        assert queue.requeue_expired() == 1
+        reclaimed = queue.claim("worker-b", lease_seconds=60)
+
+        assert reclaimed.item_id == item.item_id
+        assert reclaimed.attempts == 2
+        assert not queue.complete(item.item_id, "worker-a")
+        assert queue.complete(item.item_id, "worker-b")
+
+    def test_fail_and_heartbeat(self, queue):
+        queue.enqueue('artist', "https://www.discogs.com/artist/1-a")
+        item = queue.claim("worker-a", lease_seconds=60)
+        queue.fail(item.item_id, "worker-a", "erro", max_attempts=1)
+        queue.heartbeat("worker-a", {'processed': 0})
+
+        assert queue.stats()['failed'] == 1
+        assert queue.workers()[0]['worker_id'] == "worker-a"
+
+    def test_rejects_wrong_token(self, server):
+        with pytest.raises(WorkQueueServiceError, match="401"):
+            HttpWorkQueue(server.url, token="errado").stats()
+
+    def test_unreachable_coordinator(self):
+        queue = HttpWorkQueue("http://127.0.0.1:1", timeout=1, max_retries=1)
+
+        with pytest.raises(WorkQueueServiceError):
+            queue.stats()
+
+    def test_worker_drains_remote_queue(self, queue, tmpdir):
+        urls = [f"https://www.discogs.com/artist/{i}-artist{i}" for i in range(3)]
+        for url in urls:
+            queue.enqueue('artist', url, {'genre': 'Rock'})
+
+        output_file = os.path.join(tmpdir, "worker.jsonl")
+        worker = CrawlWorker(queue, FakeScraper(), output_file, "worker-remote")
+
+        assert worker.run() == 3
+        with open(output_file, 'r', encoding='utf-8') as f:
+            assert [json.loads(line)['id'] for line in f] == [f"discogs-artist-{i}" for i in range(3)]
+
+    def test_open_work_queue_by_location(self, tmpdir):
+        assert isinstance(open_work_queue("http://coordinator:8765"), HttpWorkQueue)
+        assert isinstance(open_work_queue(os.path.join(tmpdir, "queue.db")), SQLiteWorkQueue)
@@ -0,0 +1,55 @@
+from src.scraper.releases import select_canonical_releases, get_master_id
+
+class TestReleaseSelection:
+    def _sample_data(self):
+        return {
+            'Release:{"discogsId":1}': {
+                'title': 'Pablo Honey', 'released': '1994-02-01',
+                'masterRelease': {'__ref': 'MasterRelease:{"discogsId":100}'},
+                'tracks': [{}, {}]
+            },
+            'Release:{"discogsId":2}': {
+                'title': 'Pablo Honey', 'released': '1993-02-22',
+                'masterRelease': {'__ref': 'MasterRelease:{"discogsId":100}'},
+                'tracks': [{}]
+            },
+            'Release:{"discogsId":3}': {
+                'title': 'Pablo Honey', 'released': '2009',
+                'masterRelease': {'__ref': 'MasterRelease:{"discogsId":100}'},
+                'tracks': [{}, {}, {}]
+            },
+            'Release:{"discogsId":4}': {'title': 'The Bends', 'released': '1995'},
+            'MasterRelease:{"discogsId":100}': {
+                'mainRelease': {'__ref': 'Release:{"discogsId":3}'}
+            },
+        }
+    
+    def _release_keys(self, data):
+        return [key for key in data if key.startswith('Release:')]
+    
+    def test_get_master_id(self):
+        data = self._sample_data()
+        
+        assert get_master_id(data['Release:{"discogsId":1}'], data) == "100"
+        assert get_master_id(data['Release:{"discogsId":4}'], data) is None
+    
+    def test_one_release_per_master(self):
+        data = self._sample_data()
+        
+        selected = select_canonical_releases(data, self._release_keys(data), 10, "main")
+        
+        assert selected == ['Release:{"discogsId":3}', 'Release:{"discogsId":4}']
+    
+    def test_strategies(self):
+        data = self._sample_data()
+        keys = self._release_keys(data)
+        
+        assert select_canonical_releases(data, keys, 10, "earliest")[0] == 'Release:{"discogsId":2}'
+        assert select_canonical_releases(data, keys, 10, "most_tracks")[0] == 'Release:{"discogsId":3}'
+    
+    def test_budget_counts_distinct_albums(self):
+        data = self._sample_data()
+        
+        selected = select_canonical_releases(data, self._release_keys(data), 1, "earliest")
+        
+        assert selected == ['Release:{"discogsId":2}']
@@ -0,0 +1,109 @@
+from src.scraper.scheduler import CrawlBudget, run_scheduled_crawl
+from src.scraper.data_models import Artist, Album
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+class FakeScraper:
+    def __init__(self, albums_per_artist=4, clock=None):
+        self.albums_per_artist = albums_per_artist
+        self.clock = clock
+        self.calls = []
+    
+    def _tick(self, call):
+        self.calls.append(call)
+        if self.clock:
+            self.clock.now += 1
+    
+    def scrape_artist_info(self, artist_url, genre, include_albums=True):
+        self._tick(('profile', artist_url))
+        return Artist(name=artist_url, genre=genre, url=artist_url)
+    
+    def list_artist_album_urls(self, artist_url, max_albums=10):
+        self._tick(('discography', artist_url))
+        count = min(self.albums_per_artist, max_albums)
+        return [f"{artist_url}/release/{i}" for i in range(count)]
+    
+    def scrape_album_details(self, album_url):
+        self._tick(('release', album_url))
+        return Album(name=album_url, url=album_url)
+
+ARTIST_URLS = ["https://www.discogs.com/artist/1-a", "https://www.discogs.com/artist/2-b"]
+
+class TestCrawlScheduler:
+    def test_budget(self):
+        clock = FakeClock()
+        budget = CrawlBudget(deadline_seconds=10, page_budget=3, clock=clock)
+        
+        assert not budget.exhausted()
+        budget.consume_page()
+        budget.consume_page()
+        budget.consume_page()
+        assert budget.exhausted()
+        
+        budget = CrawlBudget(deadline_seconds=10, clock=clock)
+        clock.now = 10
+        assert budget.exhausted()
+        
+        budget = CrawlBudget()
+        budget.cancel()
+        assert budget.exhausted()
+    
+    def test_breadth_first_priority_order(self):
+        scraper = FakeScraper(albums_per_artist=4)
+        artists = run_scheduled_crawl(scraper, ARTIST_URLS, "Rock", CrawlBudget(), top_releases=2)
+        
+        kinds = [call[0] for call in scraper.calls]
+        assert kinds[:4] == ['profile', 'profile', 'discography', 'discography']
+        releases = [call[1].rsplit('/', 1)[-1] for call in scraper.calls[4:]]
+        # Top releases em rodízio entre artistas antes do restante das discografias
+        assert releases == ['0', '0', '1', '1', '2', '2', '3', '3']
+        assert [len(artist.albums) for artist in artists] == [4, 4]
+    
+    def test_page_budget_returns_partial_output(self):
+        scraper = FakeScraper(albums_per_artist=4)
+        artists = run_scheduled_crawl(scraper, ARTIST_URLS, "Rock", CrawlBudget(page_budget=6), top_releases=2)
+        
+        assert len(scraper.calls) == 6
+        assert [artist.name for artist in artists] == ARTIST_URLS
+        assert [len(artist.albums) for artist in artists] == [1, 1]
+    
+    def test_deadline_stops_crawl(self):
+        clock = FakeClock()
+        scraper = FakeScraper(albums_per_artist=4, clock=clock)
+        budget = CrawlBudget(deadline_seconds=3, clock=clock)
+        
+        artists = run_scheduled_crawl(scraper, ARTIST_URLS, "Rock", budget)
+        
+        assert len(scraper.calls) == 3
+        assert len(artists) == 2
+        assert all(not artist.albums for artist in artists)
+    
+    def test_time_left(self):
+        clock = FakeClock()
+        budget = CrawlBudget(deadline_seconds=10, clock=clock)
+        
+        clock.now = 4
+        assert budget.time_left() == 6
+        clock.now = 15
+        assert budget.time_left() == 0
+        assert CrawlBudget().time_left() is None
+        
+        budget = CrawlBudget(deadline_seconds=10, clock=clock)
+        budget.cancel()
+        assert budget.time_left() == 0
+    
+    def test_stage_marks_for_profiler(self):
+        scraper = FakeScraper(albums_per_artist=3)
+        stages = []
+        
+        run_scheduled_crawl(scraper, ARTIST_URLS, "Rock", CrawlBudget(), top_releases=2, on_stage=stages.append)
+        
+        assert stages == [
+            f"artista: {ARTIST_URLS[0]}", f"artista: {ARTIST_URLS[1]}", "fase: perfis",
+            "fase: discografias", "fase: releases principais", "fase: demais releases"
+        ]
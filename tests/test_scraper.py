@@ -105,4 +105,6 @@ class TestDataModels:
         assert len(artist_dict['websites']) == 1
         assert len(artist_dict['albums']) == 1
         assert artist_dict['albums'][0]['name'] == "Test Album"
-        assert len(artist_dict['albums'][0]['tracks']) == 1
\ No newline at end of file
+        assert len(artist_dict['albums'][0]['tracks']) == 1
+        assert artist_dict['id'] == artist.artist_id
+        assert artist_dict['albums'][0]['id'] == album.album_id
\ No newline at end of file
@@ -0,0 +1,80 @@
+import os
+import stat
+import sys
+import tempfile
+import pytest
+from src.scraper.virtual_display import VirtualDisplay, VirtualDisplayError
+from src.scraper.driver_manager import DriverManager
+
+FAKE_XVFB = f"""#!{sys.executable}
+import os, sys, time
+fd = int(sys.argv[sys.argv.index('-displayfd') + 1])
+os.write(fd, b'42\\n')
+os.close(fd)
+time.sleep(60)
+"""
+
+class TestVirtualDisplay:
+    @pytest.fixture
+    def fake_xvfb(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "Xvfb")
+            with open(path, 'w') as f:
+                f.write(FAKE_XVFB)
+            os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+            yield path
+    
+    def test_command_uses_minimal_screen(self):
+        display = VirtualDisplay(800, 600, depth=16)
+        command = display.command(7)
+        
+        assert command[command.index('-displayfd') + 1] == '7'
+        assert '800x600x16' in command
+        assert '-nolisten' in command
+    
+    def test_start_and_stop(self, fake_xvfb):
+        display = VirtualDisplay(xvfb_path=fake_xvfb)
+        
+        assert display.start() == ":42"
+        usage = display.resource_usage()
+        assert usage['display'] == ":42"
+        assert usage['running']
+        
+        process = display.process
+        display.stop()
+        assert process.poll() is not None
+        assert display.display is None
+    
+    def test_missing_xvfb(self):
+        with pytest.raises(VirtualDisplayError):
+            VirtualDisplay(xvfb_path="/nonexistent/Xvfb").start()
+    
+    def test_display_follows_driver_lifecycle(self, fake_xvfb):
+        displays = []
+        
+        class FakeDriver:
+            def get(self, url):
+                pass
+            
+            def quit(self):
+                pass
+        
+        def factory():
+            display = VirtualDisplay(xvfb_path=fake_xvfb)
+            display.start()
+            driver = FakeDriver()
+            displays.append((driver, display))
+            return driver
+        
+        def teardown(driver):
+            for owner, display in displays:
+                if owner is driver:
+                    display.stop()
+        
+        manager = DriverManager(factory, max_pages=1, max_rss_mb=0, teardown=teardown)
+        manager.get("https://www.discogs.com/a")
+        manager.get("https://www.discogs.com/b")
+        manager.quit()
+        
+        assert len(displays) == 2
+        assert all(display.process is None for _, display in displays)
@@ -0,0 +1,135 @@
+import os
+import json
+import tempfile
+import pytest
+from src.scraper.work_queue import SQLiteWorkQueue, WorkQueue
+from src.scraper.worker import CrawlWorker
+from src.scraper.data_models import Artist
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+class FakeScraper:
+    def __init__(self, failing_urls=()):
+        self.failing_urls = set(failing_urls)
+        self.calls = []
+    
+    def scrape_artist_info(self, artist_url, genre):
+        self.calls.append(artist_url)
+        if artist_url in self.failing_urls:
+            return None
+        return Artist(name=artist_url.rsplit('-', 1)[-1], genre=genre, url=artist_url)
+
+class TestWorkQueue:
+    def test_partial_backend_fails_on_creation(self):
+        class PartialQueue(WorkQueue):
+            def enqueue(self, kind, url, payload=None):
+                return True
+        
+        with pytest.raises(TypeError):
+            PartialQueue()
+    
+    @pytest.fixture
+    def tmpdir(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield tmpdir
+    
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+    
+    @pytest.fixture
+    def queue(self, tmpdir, clock):
+        return SQLiteWorkQueue(os.path.join(tmpdir, "queue.db"), clock=clock)
+    
+    def test_enqueue_is_idempotent(self, queue):
+        assert queue.enqueue('artist', "https://www.discogs.com/artist/1-a", {'genre': 'Rock'})
+        assert not queue.enqueue('artist', "https://www.discogs.com/artist/1-a")
+        assert queue.stats()['pending'] == 1
+    
+    def test_claim_leases_item_exclusively(self, queue):
+        queue.enqueue('artist', "https://www.discogs.com/artist/1-a", {'genre': 'Rock'})
+        
+        item = queue.claim("worker-a", lease_seconds=60)
+        assert item.url == "https://www.discogs.com/artist/1-a"
+        assert item.payload == {'genre': 'Rock'}
+        assert queue.claim("worker-b", lease_seconds=60) is None
+        
+        assert queue.complete(item.item_id, "worker-a")
+        assert queue.is_drained()
+    
+    def test_expired_lease_is_requeued(self, queue, clock):
+        queue.enqueue('artist', "https://www.discogs.com/artist/1-a")
+        item = queue.claim("worker-a", lease_seconds=60)
+        
+        clock.now += 61
+        reclaimed = queue.claim("worker-b", lease_seconds=60)
+        
+        assert reclaimed.item_id == item.item_id
+        assert reclaimed.attempts == 2
+        # O worker original perdeu o lease e não consegue mais concluir
+        assert not queue.complete(item.item_id, "worker-a")
+        assert queue.complete(item.item_id, "worker-b")
+    
+    def test_renew_keeps_lease(self, queue, clock):
+        queue.enqueue('artist', "https://www.discogs.com/artist/1-a")
+        item = queue.claim("worker-a", lease_seconds=60)
+        
+        clock.now += 50
+        assert queue.renew(item.item_id, "worker-a", 60)
+        clock.now += 50
+        assert queue.requeue_expired() == 0
+    
+    def test_fail_retries_until_max_attempts(self, queue):
+        queue.enqueue('artist', "https://www.discogs.com/artist/1-a")
+        
+        for _ in range(2):
+            item = queue.claim("worker-a", lease_seconds=60)
+            queue.fail(item.item_id, "worker-a", "erro", max_attempts=2)
+        
+        assert queue.stats()['failed'] == 1
+        assert queue.claim("worker-a", lease_seconds=60) is None
+    
+    def test_worker_drains_queue(self, queue, tmpdir):
+        urls = [f"https://www.discogs.com/artist/{i}-artist{i}" for i in range(3)]
+        for url in urls:
+            queue.enqueue('artist', url, {'genre': 'Rock'})
+        
+        output_file = os.path.join(tmpdir, "worker.jsonl")
+        scraper = FakeScraper(failing_urls=[urls[1]])
+        worker = CrawlWorker(queue, scraper, output_file, "worker-a", max_attempts=1)
+        
+        assert worker.run() == 2
+        assert queue.stats() == {'pending': 0, 'leased': 0, 'done': 2, 'failed': 1}
+        
+        with open(output_file, 'r', encoding='utf-8') as f:
+            ids = [json.loads(line)['id'] for line in f]
+        assert ids == ["discogs-artist-0", "discogs-artist-2"]
+        
+        workers = queue.workers()
+        assert workers[0]['worker_id'] == "worker-a"
+        assert workers[0]['processed'] == 2
+    
+    def test_worker_does_not_count_lost_lease(self, queue, tmpdir, clock):
+        queue.enqueue('artist', "https://www.discogs.com/artist/1-slow", {'genre': 'Rock'})
+        
+        class SlowScraper(FakeScraper):
+            def scrape_artist_info(self, artist_url, genre):
+                # A coleta passa do lease e outro worker assume o item
+                clock.now += 61
+                assert queue.claim("worker-b", lease_seconds=60) is not None
+                return super().scrape_artist_info(artist_url, genre)
+        
+        output_file = os.path.join(tmpdir, "worker.jsonl")
+        worker = CrawlWorker(queue, SlowScraper(), output_file, "worker-a", lease_seconds=60)
+        
+        assert worker.run(max_items=1, idle_timeout=0) == 0
+        assert worker.lost_leases == 1
+        assert worker.failed == 0
+        assert worker.artists == []
+        assert os.path.getsize(output_file) == 0
+        assert queue.stats()['leased'] == 1